@@ -3,48 +3,368 @@
 Script para comparar los modelos de Django con el estado actual de la base de datos.
 Detecta campos faltantes, sobrantes, y diferencias de tipo.
 
-IMPORTANTE: Este script debe ser adaptado a tu proyecto Django:
-    1. Cambiar 'pymemadweb.settings' (línea 13) por el nombre de tu proyecto
-    2. Actualizar PROJECT_APPS (líneas 146-160) con las apps de tu proyecto
-    3. Ejecutar desde el directorio raíz del proyecto Django
+Soporta múltiples bases de datos (alias de DATABASES) y múltiples esquemas de
+PostgreSQL (esquema por tenant). Cada combinación base de datos/esquema se
+verifica en un pool de hilos acotado, con una conexión por worker, y los
+resultados se combinan en un único reporte.
+
+La introspección usa `connection.introspection` de Django, por lo que funciona
+con cualquier motor (SQLite, MySQL, ...). En PostgreSQL se usa una ruta rápida
+que obtiene todas las columnas de un esquema en una sola consulta.
+
+No requiere editar el script:
+    - El módulo de settings se toma de --settings, de DJANGO_SETTINGS_MODULE
+      o del manage.py del directorio actual
+    - Las apps del proyecto se autodetectan (se excluyen Django y las apps de
+      terceros instaladas en site-packages), o se indican con --apps
 
 Uso:
     python check_model_db_sync.py
+    python check_model_db_sync.py --settings config.settings.local --apps accounts billing
+    python check_model_db_sync.py --all-databases --all-schemas
+    python check_model_db_sync.py --database default --schema 'tenant_*' --workers 8
+    python check_model_db_sync.py --format ndjson > sync.ndjson
+    python check_model_db_sync.py --format junit > sync-report.xml
+
+Como librería (con Django ya configurado; importar no ejecuta django.setup()):
+    from check_model_db_sync import iter_sync_results
+    for result in iter_sync_results(app_labels=['accounts']):
+        ...
 
 Documentación completa:
     docs/guides/MODEL_DB_SYNC_GUIDE.md
 """
 import os
+import re
 import sys
+import json
+import queue
+import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
 import django
-from django.db import connection
+from django.db import connections, DEFAULT_DB_ALIAS
 from django.apps import apps
 
-# ⚠️ CONFIGURAR: Cambiar por el nombre de tu proyecto Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pymemadweb.settings')
-django.setup()
+# Esquemas internos de PostgreSQL que nunca corresponden a un tenant
+SYSTEM_SCHEMAS = ('information_schema', 'pg_catalog', 'pg_toast')
+
+# Directorios donde se instalan las apps de terceros
+THIRD_PARTY_DIRS = {'site-packages', 'dist-packages'}
+
+def find_settings_module(manage_py='manage.py'):
+    """Obtiene DJANGO_SETTINGS_MODULE desde el manage.py del proyecto"""
+    manage_py = Path(manage_py)
+    if not manage_py.exists():
+        return None
+
+    match = re.search(
+        r"""DJANGO_SETTINGS_MODULE['"]\s*,\s*['"]([\w.]+)['"]""",
+        manage_py.read_text(encoding='utf-8')
+    )
+    return match.group(1) if match else None
+
+def setup_django(settings_module=None):
+    """
+    Configura Django para el proyecto del directorio actual.
+
+    Args:
+        settings_module (str): Módulo de settings (opcional, usa
+            DJANGO_SETTINGS_MODULE o el manage.py si no se proporciona)
+    """
+    if settings_module:
+        os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    elif not os.environ.get('DJANGO_SETTINGS_MODULE'):
+        detected = find_settings_module()
+        if not detected:
+            raise ValueError(
+                "No se pudo determinar DJANGO_SETTINGS_MODULE. "
+                "Usa --settings o ejecuta desde el directorio de manage.py."
+            )
+        os.environ['DJANGO_SETTINGS_MODULE'] = detected
+
+    # Permite ejecutar el script desde devtools sin copiarlo al proyecto
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    django.setup()
+
+def discover_project_apps(base_dir=None):
+    """
+    Autodetecta las apps del proyecto con apps.get_app_configs().
+
+    Se excluyen las apps instaladas en site-packages/dist-packages (Django y
+    terceros) y las que están fuera del directorio del proyecto.
 
-def get_table_columns(table_name):
-    """Obtiene las columnas de una tabla desde PostgreSQL"""
-    with connection.cursor() as cursor:
+    Args:
+        base_dir (str|Path): Raíz del proyecto (default: settings.BASE_DIR o cwd)
+
+    Returns:
+        list: AppConfig de las apps del proyecto
+    """
+    from django.conf import settings
+
+    base_dir = Path(base_dir or getattr(settings, 'BASE_DIR', None) or os.getcwd()).resolve()
+
+    project_apps = []
+    for app_config in apps.get_app_configs():
+        app_path = Path(app_config.path).resolve()
+        if THIRD_PARTY_DIRS & set(app_path.parts):
+            continue
+        if app_path != base_dir and base_dir not in app_path.parents:
+            continue
+        project_apps.append(app_config)
+    return project_apps
+
+def resolve_app_configs(app_labels=None):
+    """Obtiene los AppConfig indicados con --apps, o los autodetecta"""
+    if not app_labels:
+        return discover_project_apps()
+
+    app_configs = []
+    for app_label in app_labels:
+        try:
+            app_configs.append(apps.get_app_config(app_label))
+        except LookupError:
+            print(f"⚠️  App '{app_label}' no encontrada", file=sys.stderr)
+    return app_configs
+
+def get_schemas(using=DEFAULT_DB_ALIAS):
+    """Obtiene los esquemas de usuario de una base de datos PostgreSQL"""
+    with connections[using].cursor() as cursor:
         cursor.execute("""
-            SELECT column_name, data_type, is_nullable, character_maximum_length, column_default
-            FROM information_schema.columns
-            WHERE table_name = %s
-            ORDER BY ordinal_position;
-        """, [table_name])
-        columns = {}
-        for row in cursor.fetchall():
-            col_name, data_type, is_nullable, max_length, default = row
-            columns[col_name] = {
-                'type': data_type,
-                'nullable': is_nullable == 'YES',
-                'max_length': max_length,
-                'default': default
+            SELECT schema_name
+            FROM information_schema.schemata
+            WHERE NOT (schema_name = ANY(%s))
+              AND schema_name NOT LIKE 'pg_temp_%%'
+              AND schema_name NOT LIKE 'pg_toast_temp_%%'
+            ORDER BY schema_name;
+        """, [list(SYSTEM_SCHEMAS)])
+        return [row[0] for row in cursor.fetchall()]
+
+class Introspector:
+    """
+    Introspección genérica basada en connection.introspection de Django.
+
+    Funciona con cualquier motor soportado por Django, con una consulta por
+    tabla. Solo conoce el esquema por defecto de la conexión.
+    """
+
+    def __init__(self, connection, schema=None):
+        self.connection = connection
+        self.schema = schema
+        self._table_names = None
+
+    def table_names(self):
+        """Nombres de tablas y vistas existentes"""
+        if self._table_names is None:
+            with self.connection.cursor() as cursor:
+                self._table_names = set(
+                    self.connection.introspection.table_names(cursor, include_views=True)
+                )
+        return self._table_names
+
+    def table_exists(self, table_name):
+        return table_name in self.table_names()
+
+    def describe_column(self, info):
+        """Convierte un FieldInfo de Django al formato de columna del script"""
+        try:
+            field_type = self.connection.introspection.get_field_type(info.type_code, info)
+        except KeyError:
+            field_type = None
+
+        return {
+            'type': info.type_code,
+            'field_type': field_type,
+            'nullable': bool(info.null_ok),
+            'max_length': info.display_size,
+            'default': info.default,
+        }
+
+    def get_table_columns(self, table_name):
+        """Obtiene las columnas de una tabla"""
+        with self.connection.cursor() as cursor:
+            description = self.connection.introspection.get_table_description(cursor, table_name)
+        return {info.name: self.describe_column(info) for info in description}
+
+    def get_table_indexes(self, table_name):
+        """Obtiene los índices (incluidas restricciones unique) de una tabla"""
+        with self.connection.cursor() as cursor:
+            constraints = self.connection.introspection.get_constraints(cursor, table_name)
+        return [
+            {
+                'name': name,
+                'columns': list(constraint['columns']),
+                'unique': bool(constraint['unique'] or constraint['primary_key']),
             }
-        return columns
+            for name, constraint in constraints.items()
+            if constraint['index'] or constraint['unique'] or constraint['primary_key']
+        ]
+
+    def get_table_stats(self, table_name):
+        """
+        Estadísticas de tamaño de la tabla (filas, páginas, bytes).
+
+        La implementación genérica no las conoce: contar filas puede ser tan
+        caro como la migración que se quiere estimar.
+        """
+        return {'rows': None, 'pages': None, 'bytes': None}
+
+class PostgresIntrospector(Introspector):
+    """
+    Ruta rápida para PostgreSQL: carga todas las tablas y columnas del esquema
+    con dos consultas a pg_catalog, en lugar de dos consultas por modelo.
+    """
+
+    _indexes = None
+
+    def _load(self):
+        from django.db.backends.postgresql.introspection import FieldInfo
+
+        with self.connection.cursor() as cursor:
+            # reltuples/relpages son estimaciones mantenidas por VACUUM/ANALYZE
+            cursor.execute("""
+                SELECT c.relname, c.reltuples, c.relpages, current_setting('block_size')::int
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = COALESCE(%s, current_schema())
+                  AND c.relkind IN ('f', 'm', 'p', 'r', 'v');
+            """, [self.schema])
+            self._table_names = set()
+            self._stats = {}
+            for table_name, reltuples, relpages, block_size in cursor.fetchall():
+                self._table_names.add(table_name)
+                # reltuples = -1 (PostgreSQL 14+): la tabla nunca fue analizada
+                if reltuples is None or reltuples < 0:
+                    self._stats[table_name] = {'rows': None, 'pages': None, 'bytes': None}
+                else:
+                    self._stats[table_name] = {
+                        'rows': int(reltuples),
+                        'pages': relpages,
+                        'bytes': relpages * block_size,
+                    }
+
+            cursor.execute("""
+                SELECT
+                    c.relname,
+                    a.attname,
+                    a.atttypid,
+                    format_type(a.atttypid, a.atttypmod),
+                    CASE WHEN a.atttypid IN (1042, 1043) AND a.atttypmod > 0
+                         THEN a.atttypmod - 4 END,
+                    NOT (a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)),
+                    pg_get_expr(ad.adbin, ad.adrelid),
+                    a.attidentity != ''
+                FROM pg_attribute a
+                JOIN pg_class c ON c.oid = a.attrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                JOIN pg_type t ON t.oid = a.atttypid
+                LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+                WHERE n.nspname = COALESCE(%s, current_schema())
+                  AND c.relkind IN ('f', 'm', 'p', 'r', 'v')
+                  AND a.attnum > 0
+                  AND NOT a.attisdropped
+                ORDER BY c.relname, a.attnum;
+            """, [self.schema])
+
+            # FieldInfo cambia entre versiones de Django: se rellenan por nombre
+            empty_info = FieldInfo(*([None] * len(FieldInfo._fields)))
+            self._columns = {}
+            for (table_name, name, type_code, db_type, max_length,
+                 null_ok, default, is_autofield) in cursor.fetchall():
+                info = empty_info._replace(
+                    name=name, type_code=type_code, display_size=max_length,
+                    null_ok=null_ok, default=default, is_autofield=is_autofield,
+                )
+                column = self.describe_column(info)
+                column['type'] = db_type
+                self._columns.setdefault(table_name, {})[name] = column
+
+    def _load_indexes(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    t.relname,
+                    i.relname,
+                    ix.indisunique OR ix.indisprimary,
+                    array_agg(a.attname ORDER BY k.ord)
+                FROM pg_index ix
+                JOIN pg_class i ON i.oid = ix.indexrelid
+                JOIN pg_class t ON t.oid = ix.indrelid
+                JOIN pg_namespace n ON n.oid = t.relnamespace
+                CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+                LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+                WHERE n.nspname = COALESCE(%s, current_schema())
+                GROUP BY t.relname, i.relname, ix.indisunique, ix.indisprimary;
+            """, [self.schema])
+
+            self._indexes = {}
+            for table_name, name, unique, columns in cursor.fetchall():
+                self._indexes.setdefault(table_name, []).append({
+                    'name': name,
+                    # Índices sobre expresiones tienen attnum = 0 (columna NULL)
+                    'columns': [column for column in columns if column],
+                    'unique': unique,
+                })
+
+    def table_names(self):
+        if self._table_names is None:
+            self._load()
+        return self._table_names
 
-def get_model_fields(model):
+    def get_table_columns(self, table_name):
+        self.table_names()
+        return self._columns.get(table_name, {})
+
+    def get_table_indexes(self, table_name):
+        if self._indexes is None:
+            self._load_indexes()
+        return self._indexes.get(table_name, [])
+
+    def get_table_stats(self, table_name):
+        self.table_names()
+        return self._stats.get(table_name, {'rows': None, 'pages': None, 'bytes': None})
+
+# Introspector por motor (connection.vendor); se pueden registrar otros
+INTROSPECTORS = {
+    'postgresql': PostgresIntrospector,
+}
+
+def get_introspector(using=DEFAULT_DB_ALIAS, schema=None):
+    """Crea el introspector adecuado para el motor del alias"""
+    connection = connections[using]
+    introspector_class = INTROSPECTORS.get(connection.vendor, Introspector)
+    return introspector_class(connection, schema=schema)
+
+def classify_default(field):
+    """
+    Clasifica el default que usará la migración al agregar la columna.
+
+    Returns:
+        str|None: None (sin default), 'constant', 'stable' o 'volatile'
+    """
+    from django.db.models import NOT_PROVIDED, Value
+    from django.db.models.functions import Now
+
+    db_default = getattr(field, 'db_default', NOT_PROVIDED)
+    if db_default is not NOT_PROVIDED:
+        if isinstance(db_default, Value):
+            return 'constant'
+        if isinstance(db_default, Now):
+            return 'stable'
+        # Otras expresiones (RandomUUID, funciones propias...): se asume lo peor
+        return 'volatile'
+
+    # Django evalúa los callables una sola vez y agrega la columna con ese valor
+    if field.has_default():
+        return 'constant'
+    return None
+
+def get_model_fields(model, connection=None):
     """Obtiene los campos del modelo Django"""
     from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 
@@ -79,24 +399,268 @@ def get_model_fields(model):
             'null': field.null if hasattr(field, 'null') else True,
             'blank': field.blank if hasattr(field, 'blank') else True,
             'default': field.default if hasattr(field, 'default') else None,
+            'default_kind': classify_default(field) if hasattr(field, 'has_default') else None,
+            'db_type': field.db_type(connection) if connection is not None else None,
+            'unique': getattr(field, 'unique', False),
         }
     return fields
 
-def compare_model_with_db(model):
+def get_model_indexes(model):
+    """
+    Obtiene los índices que Django crea para el modelo.
+
+    Incluye db_index/unique de los campos (y ForeignKey), unique_together,
+    index_together, Meta.indexes y UniqueConstraint sin condición. Los índices
+    sobre expresiones o parciales se ignoran.
+
+    Returns:
+        list: [{'name', 'columns', 'unique'}]
+    """
+    from django.db.models import UniqueConstraint
+
+    opts = model._meta
+
+    def columns_for(field_names):
+        return [opts.get_field(name.lstrip('-')).column for name in field_names]
+
+    indexes = []
+    for field in opts.local_concrete_fields:
+        if field.primary_key:
+            continue
+        if field.unique:
+            indexes.append({'name': None, 'columns': [field.column], 'unique': True})
+        elif field.db_index:
+            indexes.append({'name': None, 'columns': [field.column], 'unique': False})
+
+    for field_names in opts.unique_together:
+        indexes.append({'name': None, 'columns': columns_for(field_names), 'unique': True})
+
+    for field_names in getattr(opts, 'index_together', ()):
+        indexes.append({'name': None, 'columns': columns_for(field_names), 'unique': False})
+
+    for index in opts.indexes:
+        if index.fields and not index.contains_expressions and index.condition is None:
+            indexes.append({'name': index.name, 'columns': columns_for(index.fields), 'unique': False})
+
+    for constraint in opts.constraints:
+        if (isinstance(constraint, UniqueConstraint) and constraint.fields
+                and not constraint.contains_expressions and constraint.condition is None):
+            indexes.append({'name': constraint.name, 'columns': columns_for(constraint.fields), 'unique': True})
+
+    return indexes
+
+def index_exists(expected, db_indexes):
+    """
+    Indica si algún índice de la BD cubre el índice esperado.
+
+    Un índice unique debe existir con las mismas columnas; uno normal queda
+    cubierto por cualquier índice cuyas primeras columnas coincidan.
+    """
+    for db_index in db_indexes:
+        if expected['unique']:
+            if db_index['unique'] and set(db_index['columns']) == set(expected['columns']):
+                return True
+        elif db_index['columns'][:len(expected['columns'])] == expected['columns']:
+            return True
+    return False
+
+# Sinónimos de tipos entre Field.db_type() y lo que reporta la BD
+DB_TYPE_ALIASES = (
+    (r'\bcharacter varying\b', 'varchar'),
+    (r'\bcharacter\b', 'char'),
+    (r'\btime without time zone\b', 'time'),
+    (r'\btimestamp without time zone\b', 'timestamp'),
+    (r'\bbigserial\b', 'bigint'),
+    (r'\bsmallserial\b', 'smallint'),
+    (r'\bserial\b', 'integer'),
+)
+
+def normalize_db_type(db_type):
+    """Normaliza un tipo SQL para poder comparar modelo y BD"""
+    db_type = ' '.join(db_type.lower().split())
+    for pattern, replacement in DB_TYPE_ALIASES:
+        db_type = re.sub(pattern, replacement, db_type)
+    return re.sub(r'\s*([(),])\s*', r'\1', db_type)
+
+# Estrategia de migración → (severidad, bloqueo que toma en PostgreSQL)
+MIGRATION_STRATEGIES = {
+    'metadata': (1, 'ACCESS EXCLUSIVE (breve)'),
+    'index_build': (2, 'SHARE (bloquea escrituras)'),
+    'rewrite': (3, 'ACCESS EXCLUSIVE (toda la reescritura)'),
+}
+
+# SQLite no tiene bloqueos por tabla: cualquier DDL toma el bloqueo de
+# escritura de toda la base de datos
+SQLITE_MIGRATION_STRATEGIES = {
+    'metadata': (1, 'escritura de toda la BD (breve)'),
+    'index_build': (2, 'escritura de toda la BD'),
+    'rebuild': (3, 'escritura de toda la BD (copia completa de la tabla)'),
+}
+
+VENDOR_MIGRATION_STRATEGIES = {
+    'postgresql': MIGRATION_STRATEGIES,
+    'sqlite': SQLITE_MIGRATION_STRATEGIES,
+}
+
+# Motores sin reglas conocidas: no se inventan bloqueos
+UNKNOWN_STRATEGY = (0, 'desconocido (depende del motor)')
+
+AUTO_FIELD_TYPES = ('AutoField', 'BigAutoField', 'SmallAutoField')
+
+def is_metadata_only_type_change(current_type, new_type):
+    """
+    Indica si PostgreSQL puede cambiar el tipo sin reescribir la tabla:
+    ampliar varchar(n), pasar de varchar a text o ampliar la precisión de
+    numeric manteniendo la escala.
+    """
+    current, new = normalize_db_type(current_type), normalize_db_type(new_type)
+
+    current_varchar = re.fullmatch(r'varchar(?:\((\d+)\))?', current)
+    if current_varchar:
+        if new == 'text':
+            return True
+        new_varchar = re.fullmatch(r'varchar(?:\((\d+)\))?', new)
+        if not new_varchar:
+            return False
+        if new_varchar.group(1) is None:
+            return True
+        return (current_varchar.group(1) is not None
+                and int(new_varchar.group(1)) >= int(current_varchar.group(1)))
+
+    current_numeric = re.fullmatch(r'numeric\((\d+),(\d+)\)', current)
+    new_numeric = re.fullmatch(r'numeric(?:\((\d+),(\d+)\))?', new)
+    if current_numeric and new_numeric:
+        if new_numeric.group(1) is None:
+            return True
+        return (new_numeric.group(2) == current_numeric.group(2)
+                and int(new_numeric.group(1)) >= int(current_numeric.group(1)))
+
+    return False
+
+def estimate_migration_costs(table_name, missing_fields, type_changes, missing_indexes,
+                             stats, vendor='postgresql'):
+    """
+    Estima el costo de las operaciones que corrigen la desincronización.
+
+    Las reglas dependen del motor: PostgreSQL 11+ (el tamaño sale de
+    pg_class.reltuples/relpages), SQLite (Django recrea la tabla con
+    _remake_table para casi todo) y, para otros motores, costo desconocido.
+
+    Args:
+        table_name (str): Tabla afectada
+        missing_fields (list): Campos faltantes en DB (con 'column')
+        type_changes (list): Cambios de tipo detectados
+        missing_indexes (list): Índices faltantes
+        stats (dict): {'rows', 'pages', 'bytes'} de la tabla (None si no se conoce)
+        vendor (str): connection.vendor
+
+    Returns:
+        list: Operaciones ordenadas de mayor a menor costo
+    """
+    operations = []
+    pages = stats['pages']
+    strategies = VENDOR_MIGRATION_STRATEGIES.get(vendor, {})
+
+    def add_operation(column, operation, strategy, recommendation):
+        severity, lock = strategies.get(strategy, UNKNOWN_STRATEGY)
+        if pages is None or strategy == 'unknown':
+            io_pages = None
+        else:
+            # Reescribir lee y escribe el heap; un índice lo lee completo
+            io_pages = {'metadata': 0, 'index_build': pages, 'rewrite': 2 * pages, 'rebuild': 2 * pages}[strategy]
+        operations.append({
+            'table': table_name,
+            'column': column,
+            'operation': operation,
+            'strategy': strategy,
+            'lock': lock,
+            'lock_severity': severity,
+            'rows': stats['rows'],
+            'bytes': stats['bytes'],
+            'io_pages': io_pages,
+            'recommendation': recommendation,
+        })
+
+    if vendor == 'postgresql':
+        for field in missing_fields:
+            if field['default_kind'] == 'volatile':
+                add_operation(field['column'], 'add_column', 'rewrite',
+                              "Default volátil: agregar nullable sin default, poblar por lotes "
+                              "y luego fijar default/NOT NULL")
+            elif field['field_type'] in AUTO_FIELD_TYPES:
+                add_operation(field['column'], 'add_column', 'rewrite',
+                              "Columna autoincremental: se genera un valor para cada fila")
+            elif not field['null'] and field['default_kind'] is None:
+                add_operation(field['column'], 'add_column', 'metadata',
+                              "NOT NULL sin default: makemigrations pedirá un default constante "
+                              "(solo metadatos)")
+            else:
+                add_operation(field['column'], 'add_column', 'metadata',
+                              "Solo metadatos (nullable o default constante)")
+
+        for change in type_changes:
+            if is_metadata_only_type_change(change['db_type'], change['model_type']):
+                add_operation(change['field'], 'alter_type', 'metadata',
+                              f"{change['db_type']} → {change['model_type']}: ampliación compatible, "
+                              "solo metadatos")
+            else:
+                add_operation(change['field'], 'alter_type', 'rewrite',
+                              f"{change['db_type']} → {change['model_type']}: reescribe la tabla y "
+                              "sus índices; considerar columna nueva + copia por lotes")
+
+        for index in missing_indexes:
+            if index['unique']:
+                recommendation = ("Usar CREATE UNIQUE INDEX CONCURRENTLY y luego "
+                                  "ADD CONSTRAINT ... USING INDEX")
+            else:
+                recommendation = ("Usar AddIndexConcurrently (CREATE INDEX CONCURRENTLY) "
+                                  "en una migración con atomic = False")
+            add_operation(', '.join(index['columns']), 'create_index', 'index_build', recommendation)
+
+    elif vendor == 'sqlite':
+        # Django solo usa ALTER TABLE ADD COLUMN para columnas nullable sin
+        # default ni unique; el resto de AddField y todo AlterField recrea la tabla
+        for field in missing_fields:
+            if (field['null'] and field['default_kind'] is None and not field['unique']
+                    and field['field_type'] not in AUTO_FIELD_TYPES):
+                add_operation(field['column'], 'add_column', 'metadata',
+                              "ALTER TABLE ADD COLUMN: solo metadatos (nullable sin default ni unique)")
+            else:
+                add_operation(field['column'], 'add_column', 'rebuild',
+                              "Django recrea la tabla (copia completa) para columnas NOT NULL, "
+                              "con default o unique")
+
+        for change in type_changes:
+            add_operation(change['field'], 'alter_type', 'rebuild',
+                          f"{change['db_type']} → {change['model_type']}: Django recrea la tabla "
+                          "(copia completa) en cualquier AlterField")
+
+        for index in missing_indexes:
+            add_operation(', '.join(index['columns']), 'create_index', 'index_build',
+                          "Construcción de índice: bloquea las escrituras de toda la BD mientras dura")
+
+    else:
+        recommendation = f"Sin reglas de costo para '{vendor}': revisar el SQL con sqlmigrate"
+        for field in missing_fields:
+            add_operation(field['column'], 'add_column', 'unknown', recommendation)
+        for change in type_changes:
+            add_operation(change['field'], 'alter_type', 'unknown',
+                          f"{change['db_type']} → {change['model_type']}: {recommendation}")
+        for index in missing_indexes:
+            add_operation(', '.join(index['columns']), 'create_index', 'unknown', recommendation)
+
+    operations.sort(key=operation_cost_key, reverse=True)
+    return operations
+
+def operation_cost_key(operation):
+    """Clave de orden: primero el bloqueo más severo, luego el IO estimado"""
+    return (operation['lock_severity'], operation['io_pages'] or 0)
+
+def compare_model_with_db(model, introspector):
     """Compara un modelo con su tabla en la base de datos"""
     table_name = model._meta.db_table
 
-    # Verificar si la tabla existe
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_name = %s
-            );
-        """, [table_name])
-        table_exists = cursor.fetchone()[0]
-
-    if not table_exists:
+    if not introspector.table_exists(table_name):
         return {
             'status': 'missing_table',
             'table_name': table_name,
@@ -104,8 +668,8 @@ def compare_model_with_db(model):
         }
 
     # Obtener columnas de DB y modelo
-    db_columns = get_table_columns(table_name)
-    model_fields = get_model_fields(model)
+    db_columns = introspector.get_table_columns(table_name)
+    model_fields = get_model_fields(model, introspector.connection)
 
     # Comparar
     missing_in_db = set(model_fields.keys()) - set(db_columns.keys())
@@ -130,14 +694,58 @@ def compare_model_with_db(model):
             'db_info': db_columns[field_name]
         })
 
-    if issues or missing_in_db or missing_in_model:
+    # Tipos distintos (solo si la BD reporta el tipo como texto SQL)
+    type_changes = []
+    for field_name in sorted(common_fields):
+        expected_type = model_fields[field_name]['db_type']
+        current_type = db_columns[field_name]['type']
+        if not (isinstance(expected_type, str) and isinstance(current_type, str)):
+            continue
+        if normalize_db_type(expected_type) != normalize_db_type(current_type):
+            type_changes.append({
+                'field': field_name,
+                'db_type': current_type,
+                'model_type': expected_type,
+            })
+            issues.append({
+                'type': 'type_mismatch',
+                'field': field_name,
+                'field_info': model_fields[field_name],
+                'db_info': db_columns[field_name],
+            })
+
+    # Índices faltantes (Django no gestiona los de modelos unmanaged)
+    missing_indexes = []
+    if model._meta.managed:
+        db_indexes = introspector.get_table_indexes(table_name)
+        for index in get_model_indexes(model):
+            if not index_exists(index, db_indexes):
+                missing_indexes.append(index)
+                issues.append({
+                    'type': 'missing_index',
+                    'field': ', '.join(index['columns']),
+                    'index_info': index,
+                })
+
+    if issues:
+        operations = estimate_migration_costs(
+            table_name,
+            [dict(model_fields[field_name], column=field_name) for field_name in sorted(missing_in_db)],
+            type_changes,
+            missing_indexes,
+            introspector.get_table_stats(table_name),
+            vendor=introspector.connection.vendor,
+        )
         return {
             'status': 'mismatch',
             'table_name': table_name,
             'model': model.__name__,
             'issues': issues,
-            'missing_in_db': list(missing_in_db),
-            'missing_in_model': list(missing_in_model),
+            'missing_in_db': sorted(missing_in_db),
+            'missing_in_model': sorted(missing_in_model),
+            'type_changes': type_changes,
+            'missing_indexes': missing_indexes,
+            'operations': operations,
         }
 
     return {
@@ -146,81 +754,345 @@ def compare_model_with_db(model):
         'model': model.__name__,
     }
 
-def main():
-    """Función principal"""
-    print("=" * 80)
-    print("🔍 VERIFICACIÓN DE SINCRONIZACIÓN: MODELOS DJANGO vs BASE DE DATOS")
-    print("=" * 80)
-    print()
-
-    # ⚠️ CONFIGURAR: Actualizar con las apps de tu proyecto Django
-    PROJECT_APPS = [
-        'accounts',
-        'billing',
-        'communications',
-        'core',
-        'documents',
-        'governance',
-        'landing',
-        'members',
-        'news',
-        'panel',
-        'permissions',
-        'scrapers',
-        'strategy',
-    ]
-
-    all_ok = True
-    total_issues = 0
-    models_checked = 0
-
-    for app_label in PROJECT_APPS:
-        try:
-            app_config = apps.get_app_config(app_label)
-        except LookupError:
-            print(f"⚠️  App '{app_label}' no encontrada")
-            continue
+def resolve_targets(database_patterns=None, schema_patterns=None,
+                    all_databases=False, all_schemas=False):
+    """
+    Calcula las combinaciones (alias, esquema) a verificar.
 
-        print(f"\n📦 App: {app_label}")
-        print("-" * 80)
+    Los filtros --database/--schema aceptan patrones estilo shell
+    ('tenant_*'). Un esquema None significa el esquema actual de la conexión
+    (search_path), que es el comportamiento por defecto.
+    """
+    aliases = list(connections)
+    if database_patterns:
+        aliases = [alias for alias in aliases
+                   if any(fnmatch(alias, pattern) for pattern in database_patterns)]
+    elif not all_databases:
+        aliases = [DEFAULT_DB_ALIAS]
 
-        models = app_config.get_models()
-        if not models:
-            print("   (sin modelos)")
+    targets = []
+    for alias in aliases:
+        if not (all_schemas or schema_patterns):
+            targets.append((alias, None))
             continue
 
-        for model in models:
-            models_checked += 1
-            result = compare_model_with_db(model)
+        if connections[alias].vendor != 'postgresql':
+            print(f"⚠️  Base de datos '{alias}' no es PostgreSQL, se ignoran los esquemas",
+                  file=sys.stderr)
+            targets.append((alias, None))
+            continue
+
+        # Si la conexión del hilo que llama no estaba abierta, se cierra al
+        # terminar; si ya estaba abierta (p. ej. dentro de transaction.atomic)
+        # pertenece al que llama y no se toca
+        connection = connections[alias]
+        was_open = connection.connection is not None
+        try:
+            schemas = get_schemas(using=alias)
+        finally:
+            if not was_open:
+                connection.close()
+        if schema_patterns:
+            schemas = [schema for schema in schemas
+                       if any(fnmatch(schema, pattern) for pattern in schema_patterns)]
+        targets.extend((alias, schema) for schema in schemas)
+
+    return targets
+
+def check_target(alias, schema, app_configs):
+    """
+    Verifica todas las apps contra un alias/esquema.
+
+    Se ejecuta dentro de un worker del pool. Las conexiones de Django son
+    locales al hilo: cada worker abre una conexión por alias y la reutiliza
+    para todos los esquemas que procesa (el introspector filtra por esquema,
+    no cambia el search_path). iter_target_results las cierra al terminar.
 
-            if result['status'] == 'ok':
-                print(f"   ✅ {result['model']:30} → {result['table_name']}")
+    Yields:
+        dict: Resultado de cada modelo, con 'database', 'schema' y 'app'
+    """
+    introspector = get_introspector(using=alias, schema=schema)
+    for app_config in app_configs:
+        for model in app_config.get_models():
+            result = compare_model_with_db(model, introspector)
+            yield dict(result, database=alias, schema=schema, app=app_config.label)
 
-            elif result['status'] == 'missing_table':
-                print(f"   ❌ {result['model']:30} → Tabla '{result['table_name']}' NO EXISTE")
-                all_ok = False
-                total_issues += 1
+def close_connections(worker_connections):
+    """Cierra desde el hilo principal las conexiones que abrieron los workers"""
+    for connection in worker_connections:
+        connection.inc_thread_sharing()
+        try:
+            connection.close()
+        finally:
+            connection.dec_thread_sharing()
+
+def iter_target_results(targets, app_configs, workers=4):
+    """
+    Verifica los destinos en un pool de hilos y genera los resultados a
+    medida que se producen.
+
+    Los resultados salen en el orden de los destinos: el primero se transmite
+    en vivo y los siguientes se acumulan hasta que les toca. Un error de
+    conexión se reporta como un resultado con status 'error'. Se abren como
+    máximo `workers` conexiones por alias, que se cierran al terminar el pool.
+    """
+    queues = [queue.Queue() for _ in targets]
+    worker_connections = set()
+    lock = threading.Lock()
+
+    def run(target_queue, alias, schema):
+        try:
+            for result in check_target(alias, schema, app_configs):
+                target_queue.put(result)
+        except Exception as e:
+            target_queue.put({'status': 'error', 'database': alias, 'schema': schema, 'error': str(e)})
+        finally:
+            with lock:
+                worker_connections.add(connections[alias])
+            target_queue.put(None)
+
+    # Un worker por alias/esquema; el pool acota las conexiones simultáneas
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(run, target_queue, alias, schema)
+                       for target_queue, (alias, schema) in zip(queues, targets)]
+            try:
+                for target_queue in queues:
+                    for result in iter(target_queue.get, None):
+                        yield result
+            finally:
+                # Si el consumidor deja de iterar, no se inician más destinos
+                for future in futures:
+                    future.cancel()
+    finally:
+        close_connections(worker_connections)
 
-            elif result['status'] == 'mismatch':
-                print(f"   ⚠️  {result['model']:30} → {result['table_name']}")
+def iter_sync_results(app_labels=None, databases=None, schemas=None,
+                      all_databases=False, all_schemas=False, workers=4):
+    """
+    API de librería: compara los modelos con la BD y genera los resultados.
+
+    Requiere Django ya configurado (django.setup(), un management command,
+    un test...). Importar este módulo no configura Django ni abre conexiones.
+
+    Args:
+        app_labels (list): Apps a verificar (default: autodetectar)
+        databases (list): Patrones de alias de DATABASES (default: 'default')
+        schemas (list): Patrones de esquemas PostgreSQL (default: esquema actual)
+        all_databases (bool): Verificar todos los alias
+        all_schemas (bool): Verificar todos los esquemas de usuario
+        workers (int): Número máximo de workers (y conexiones) en paralelo
+
+    Yields:
+        dict: Un resultado por modelo ('ok', 'missing_table', 'mismatch') o
+            por destino con error ('error')
+    """
+    app_configs = resolve_app_configs(app_labels)
+    targets = resolve_targets(
+        database_patterns=databases,
+        schema_patterns=schemas,
+        all_databases=all_databases,
+        all_schemas=all_schemas,
+    )
+    yield from iter_target_results(targets, app_configs, workers=workers)
+
+def format_target(alias, schema):
+    """Etiqueta legible de un alias/esquema"""
+    return f"{alias}/{schema}" if schema else alias
+
+def count_issues(result):
+    """Número de problemas de un resultado (los sobrantes en DB no cuentan)"""
+    if result['status'] == 'missing_table':
+        return 1
+    if result['status'] == 'mismatch':
+        return (len(result['missing_in_db']) + len(result['type_changes'])
+                + len(result['missing_indexes']))
+    return 0
+
+def describe_issues(result):
+    """Líneas legibles con los problemas de un resultado"""
+    if result['status'] == 'missing_table':
+        return [f"❌ Tabla '{result['table_name']}' NO EXISTE"]
+    if result['status'] == 'error':
+        return [f"❌ Error verificando '{format_target(result['database'], result['schema'])}': "
+                f"{result['error']}"]
+    if result['status'] != 'mismatch':
+        return []
+
+    lines = []
+    if result['missing_in_db']:
+        lines.append(f"🔴 Faltantes en DB: {', '.join(result['missing_in_db'])}")
+
+    if result['missing_in_model']:
+        lines.append(f"🟡 Sobrantes en DB: {', '.join(result['missing_in_model'])}")
+
+    if result['type_changes']:
+        changes = ', '.join(
+            f"{change['field']} ({change['db_type']} → {change['model_type']})"
+            for change in result['type_changes']
+        )
+        lines.append(f"🟠 Tipos distintos: {changes}")
+
+    if result['missing_indexes']:
+        indexes = ', '.join(
+            f"({', '.join(index['columns'])})" + (" unique" if index['unique'] else "")
+            for index in result['missing_indexes']
+        )
+        lines.append(f"🔵 Índices faltantes: {indexes}")
+
+    return lines
+
+def new_summary(targets):
+    """Resumen vacío para acumular resultados"""
+    return {
+        'targets': len(targets),
+        'models_checked': 0,
+        'issues': 0,
+        # etiqueta del destino → problemas (None si hubo error)
+        'drifted_targets': {},
+        'operations': [],
+    }
+
+def track_summary(results, summary):
+    """Acumula cada resultado en el resumen mientras se reenvía al reporte"""
+    for result in results:
+        label = format_target(result['database'], result['schema'])
+        if result['status'] == 'error':
+            summary['drifted_targets'][label] = None
+        else:
+            summary['models_checked'] += 1
+            issues_count = count_issues(result)
+            if issues_count:
+                summary['issues'] += issues_count
+                summary['drifted_targets'][label] = (summary['drifted_targets'].get(label) or 0) + issues_count
+            summary['operations'].extend((label, operation) for operation in result.get('operations', []))
+        yield result
 
-                if result['missing_in_db']:
-                    print(f"      🔴 Faltantes en DB: {', '.join(result['missing_in_db'])}")
-                    all_ok = False
-                    total_issues += len(result['missing_in_db'])
+STRATEGY_LABELS = {
+    'metadata': ('⚡', 'solo metadatos'),
+    'index_build': ('⏳', 'construcción de índice'),
+    'rewrite': ('🔥', 'reescritura de tabla'),
+    'rebuild': ('🔥', 'recreación de tabla (copia completa)'),
+    'unknown': ('❔', 'costo desconocido'),
+}
 
-                if result['missing_in_model']:
-                    print(f"      🟡 Sobrantes en DB: {', '.join(result['missing_in_model'])}")
+OPERATION_LABELS = {
+    'add_column': 'Agregar columna',
+    'alter_type': 'Cambiar tipo',
+    'create_index': 'Crear índice',
+}
+
+def format_rows(rows):
+    """Formatea un número de filas estimado (1.2 M filas)"""
+    if rows is None:
+        return "? filas"
+    for factor, suffix in ((1e9, ' G'), (1e6, ' M'), (1e3, ' K')):
+        if rows >= factor:
+            return f"~{rows / factor:.1f}{suffix} filas"
+    return f"~{rows} filas"
+
+def format_bytes(size):
+    """Formatea un tamaño en bytes (150.0 MB)"""
+    if size is None:
+        return "? MB"
+    for factor, suffix in ((1024 ** 3, 'GB'), (1024 ** 2, 'MB'), (1024, 'KB')):
+        if size >= factor:
+            return f"{size / factor:.1f} {suffix}"
+    return f"{size} B"
+
+def print_migration_costs(operations):
+    """
+    Imprime las operaciones de migración ordenadas por costo.
+
+    Args:
+        operations (list): Tuplas (etiqueta del destino, operación)
+    """
+    if not operations:
+        return
+
+    print("\n" + "=" * 80)
+    print("💰 COSTO ESTIMADO DE MIGRACIÓN (mayor bloqueo e IO primero)")
+    print("=" * 80)
+
+    for label, operation in sorted(operations, key=lambda item: operation_cost_key(item[1]), reverse=True):
+        icon, strategy = STRATEGY_LABELS[operation['strategy']]
+        print(f"   {icon} [{label}] {OPERATION_LABELS[operation['operation']]} "
+              f"{operation['table']}.{operation['column']} → {strategy}")
+        print(f"      🔒 {operation['lock']} · {format_rows(operation['rows'])}, "
+              f"{format_bytes(operation['bytes'])}")
+        print(f"      💡 {operation['recommendation']}")
+
+def report_text(results, summary, targets, app_configs):
+    """Reporte legible con emojis, impreso a medida que llegan los resultados"""
+    multi_target = len(targets) > 1
+    if multi_target:
+        print(f"🗄️  Destinos a verificar: {len(targets)}")
+
+    app_labels = [app_config.label for app_config in app_configs]
+    current_target = None
+    pending_apps = []
+
+    def flush_empty_apps(until=None):
+        # Apps sin modelos no generan resultados: se listan al pasar por ellas
+        while pending_apps and pending_apps[0] != until:
+            print(f"\n📦 App: {pending_apps.pop(0)}")
+            print("-" * 80)
+            print("   (sin modelos)")
+
+    for result in results:
+        target = (result['database'], result['schema'])
+        if target != current_target:
+            flush_empty_apps()
+            current_target = target
+            pending_apps = list(app_labels)
+            if multi_target:
+                alias, schema = target
+                print("\n" + "#" * 80)
+                print(f"🗄️  Base de datos: {alias}" + (f" · Esquema: {schema}" if schema else ""))
+                print("#" * 80)
+
+        if result['status'] == 'error':
+            pending_apps = []
+            print(describe_issues(result)[0])
+            continue
+
+        if result['app'] in pending_apps:
+            flush_empty_apps(until=result['app'])
+            pending_apps.pop(0)
+            print(f"\n📦 App: {result['app']}")
+            print("-" * 80)
+
+        if result['status'] == 'ok':
+            print(f"   ✅ {result['model']:30} → {result['table_name']}")
+        elif result['status'] == 'missing_table':
+            print(f"   ❌ {result['model']:30} → Tabla '{result['table_name']}' NO EXISTE")
+        elif result['status'] == 'mismatch':
+            print(f"   ⚠️  {result['model']:30} → {result['table_name']}")
+            for line in describe_issues(result):
+                print(f"      {line}")
+    flush_empty_apps()
+
+    print_migration_costs(summary['operations'])
 
     print("\n" + "=" * 80)
     print("📊 RESUMEN")
     print("=" * 80)
-    print(f"Modelos verificados: {models_checked}")
-    print(f"Problemas encontrados: {total_issues}")
+    if multi_target:
+        print(f"Destinos verificados: {summary['targets']}")
+    print(f"Modelos verificados: {summary['models_checked']}")
+    print(f"Problemas encontrados: {summary['issues']}")
 
-    if all_ok and total_issues == 0:
+    drifted_targets = summary['drifted_targets']
+    if multi_target and drifted_targets:
+        print(f"\n🏢 Destinos con desincronización: {len(drifted_targets)}/{summary['targets']}")
+        for label, issues_count in drifted_targets.items():
+            if issues_count is None:
+                print(f"   ❌ {label:40} → error al verificar")
+            else:
+                print(f"   ⚠️  {label:40} → {issues_count} problema(s)")
+
+    if not drifted_targets:
         print("\n✅ ¡TODO SINCRONIZADO! Los modelos coinciden con la base de datos.")
-        return 0
     else:
         print("\n❌ HAY DESINCRONIZACIÓN. Revisa los problemas arriba.")
         print("\n💡 Soluciones:")
@@ -228,7 +1100,171 @@ def main():
         print("   2. Aplicar migraciones: python manage.py migrate")
         print("   3. Si hay desincronización compleja, usar SeparateDatabaseAndState")
         print("      Ver: docs/guides/DJANGO_MIGRATIONS_GUIDE.md")
+
+def summary_as_dict(summary):
+    """Resumen serializable (las operaciones ya van en cada resultado)"""
+    return {
+        'status': 'summary',
+        'targets': summary['targets'],
+        'models_checked': summary['models_checked'],
+        'issues': summary['issues'],
+        'drifted_targets': summary['drifted_targets'],
+    }
+
+def json_default(value):
+    """Serializa valores que no son JSON (defaults de modelos: callables, NOT_PROVIDED)"""
+    from django.db.models import NOT_PROVIDED
+
+    if value is NOT_PROVIDED:
+        return None
+    return str(value)
+
+def to_json(data):
+    return json.dumps(data, ensure_ascii=False, default=json_default)
+
+def report_ndjson(results, summary, targets, app_configs):
+    """Un objeto JSON por línea y por resultado; la última línea es el resumen"""
+    for result in results:
+        print(to_json(result), flush=True)
+    print(to_json(summary_as_dict(summary)), flush=True)
+
+def report_json(results, summary, targets, app_configs):
+    """Documento JSON {"results": [...], "summary": {...}} escrito en streaming"""
+    print('{"results": [', flush=True)
+    for index, result in enumerate(results):
+        print(('  ' if index == 0 else ', ') + to_json(result), flush=True)
+    print(f'], "summary": {to_json(summary_as_dict(summary))}}}', flush=True)
+
+def report_junit(results, summary, targets, app_configs):
+    """
+    Reporte JUnit XML para CI: un testsuite por destino y un testcase por
+    modelo. Se escribe en streaming, por lo que los testsuite no llevan
+    atributos de conteo.
+    """
+    print('<?xml version="1.0" encoding="UTF-8"?>')
+    print('<testsuites name="check_model_db_sync">', flush=True)
+
+    current_target = None
+    for result in results:
+        target = (result['database'], result['schema'])
+        if target != current_target:
+            if current_target is not None:
+                print('  </testsuite>', flush=True)
+            current_target = target
+            print(f'  <testsuite name={quoteattr(format_target(*target))}>')
+
+        if result['status'] == 'error':
+            details = describe_issues(result)[0]
+            print(f'    <testcase classname="connection" name={quoteattr(format_target(*target))}>')
+            print(f'      <error message={quoteattr(result["error"])}>{escape(details)}</error>')
+        else:
+            name = f"{result['model']} ({result['table_name']})"
+            print(f'    <testcase classname={quoteattr(result["app"])} name={quoteattr(name)}>')
+            if count_issues(result):
+                details = '\n'.join(describe_issues(result))
+                message = f"{count_issues(result)} problema(s) de sincronización"
+                print(f'      <failure message={quoteattr(message)}>{escape(details)}</failure>')
+        print('    </testcase>', flush=True)
+
+    if current_target is not None:
+        print('  </testsuite>')
+    print('</testsuites>', flush=True)
+
+REPORTERS = {
+    'text': report_text,
+    'ndjson': report_ndjson,
+    'json': report_json,
+    'junit': report_junit,
+}
+
+def parse_args(argv=None):
+    """Parsea los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description='Compara los modelos de Django con el estado actual de la base de datos'
+    )
+    parser.add_argument(
+        '--settings',
+        help='Módulo de settings de Django (default: DJANGO_SETTINGS_MODULE o manage.py)'
+    )
+    parser.add_argument(
+        '--apps',
+        nargs='+',
+        metavar='APP',
+        help='Apps a verificar (default: autodetectar las apps del proyecto)'
+    )
+    parser.add_argument(
+        '--all-databases',
+        action='store_true',
+        help='Verificar todos los alias definidos en DATABASES'
+    )
+    parser.add_argument(
+        '--database',
+        action='append',
+        metavar='ALIAS',
+        help='Verificar solo este alias (admite patrones, repetible)'
+    )
+    parser.add_argument(
+        '--all-schemas',
+        action='store_true',
+        help='Verificar todos los esquemas de usuario (PostgreSQL, esquema por tenant)'
+    )
+    parser.add_argument(
+        '--schema',
+        action='append',
+        metavar='NOMBRE',
+        help="Verificar solo este esquema (admite patrones como 'tenant_*', repetible)"
+    )
+    parser.add_argument(
+        '--format',
+        choices=sorted(REPORTERS),
+        default='text',
+        help='Formato de salida; ndjson/json/junit se escriben en streaming (default: text)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Número máximo de workers (y conexiones) en paralelo (default: 4)'
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+
+    try:
+        setup_django(args.settings)
+    except ValueError as e:
+        print(f"❌ Error de configuración: {e}", file=sys.stderr)
+        return 1
+
+    if args.format == 'text':
+        print("=" * 80)
+        print("🔍 VERIFICACIÓN DE SINCRONIZACIÓN: MODELOS DJANGO vs BASE DE DATOS")
+        print("=" * 80)
+        print()
+
+    app_configs = resolve_app_configs(args.apps)
+    if not app_configs:
+        print("❌ No se encontraron apps del proyecto para verificar", file=sys.stderr)
         return 1
 
+    targets = resolve_targets(
+        database_patterns=args.database,
+        schema_patterns=args.schema,
+        all_databases=args.all_databases,
+        all_schemas=args.all_schemas,
+    )
+
+    if not targets:
+        print("❌ Ninguna base de datos/esquema coincide con los filtros indicados", file=sys.stderr)
+        return 1
+
+    summary = new_summary(targets)
+    results = track_summary(iter_target_results(targets, app_configs, workers=args.workers), summary)
+    REPORTERS[args.format](results, summary, targets, app_configs)
+
+    return 1 if summary['drifted_targets'] else 0
+
 if __name__ == '__main__':
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -5,9 +5,16 @@ Script optimizado para traducir archivos .po usando DeepSeek API
 Reutiliza las funciones eficientes del script de traducción de Moodle
 """
 
+import codecs
+import hashlib
+import json
 import os
 import re
 import sys
+import tempfile
+import textwrap
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 import shutil
@@ -19,19 +26,568 @@ from dotenv import load_dotenv
 # Cargar variables de entorno desde .env
 load_dotenv()
 
+# Tamaño de los bloques copiados sin modificar en el modo streaming
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Versiones de cada .po que conserva el almacén de backups
+DEFAULT_BACKUP_KEEP = 30
+
+# Plural-Forms por defecto si el catálogo no declara el header
+DEFAULT_PLURAL_FORMS = {
+    'en': 'nplurals=2; plural=(n != 1);',
+    'pt': 'nplurals=2; plural=(n != 1);',
+}
+
+PLURAL_FORMS_RE = re.compile(r'nplurals\s*=\s*(\d+)\s*;\s*plural\s*=\s*([^;\n]+)')
+
+PO_KEYWORD_RE = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[(\d+)\])?)\s+"(.*)"\s*$')
+
+
+class StreamingPOEntry:
+    """
+    Entrada de un archivo .po leída en modo streaming.
+
+    Además del contenido guarda la posición en bytes de la línea de flags y
+    del bloque msgstr, para poder reemplazarlos sin reescribir el resto.
+    """
+
+    def __init__(self):
+        self.msgctxt = None
+        self.msgid = ''
+        self.msgid_plural = None
+        self.msgstr = ''
+        self.msgstr_plural = {}
+        self.flags = []
+        self.obsolete = False
+        self.flags_span = None
+        self.msgstr_span = None
+        self.newline = b'\n'
+
+    @property
+    def fuzzy(self):
+        return 'fuzzy' in self.flags
+
+
+class StreamingPOReader:
+    """
+    Lector de archivos .po que no carga el catálogo en memoria: recorre el
+    archivo línea a línea y genera las entradas una a una.
+    """
+
+    def __init__(self, po_file_path):
+        self.po_file_path = Path(po_file_path)
+        self.encoding = 'utf-8'
+
+    def __iter__(self):
+        entry = StreamingPOEntry()
+        has_content = False
+        field = None
+        position = 0
+
+        with open(self.po_file_path, 'rb') as po_file:
+            for raw_line in po_file:
+                start, position = position, position + len(raw_line)
+                line = raw_line.decode(self.encoding).strip()
+                obsolete = line.startswith('#~')
+                if obsolete:
+                    line = line[2:].strip()
+
+                if not line:
+                    if has_content:
+                        yield self._finish(entry)
+                        entry, has_content, field = StreamingPOEntry(), False, None
+                    continue
+
+                # Un comentario o un msgid después de msgstr abre otra entrada
+                starts_entry = line.startswith('#') or line.startswith(('msgctxt', 'msgid '))
+                if starts_entry and field and field.startswith('msgstr') and has_content:
+                    yield self._finish(entry)
+                    entry, has_content, field = StreamingPOEntry(), False, None
+
+                has_content = True
+                entry.obsolete = entry.obsolete or obsolete
+
+                if line.startswith('#,'):
+                    entry.flags = [flag.strip() for flag in line[2:].split(',') if flag.strip()]
+                    entry.flags_span = (start, position)
+                    continue
+                if line.startswith('#'):
+                    continue
+
+                match = PO_KEYWORD_RE.match(line)
+                if match:
+                    keyword, plural_index, value = match.groups()
+                    field = keyword if plural_index is None else f'msgstr[{plural_index}]'
+                    self._append(entry, field, polib.unescape(value), reset=True)
+                elif line.startswith('"') and line.endswith('"') and field:
+                    self._append(entry, field, polib.unescape(line[1:-1]))
+                else:
+                    continue
+
+                if field.startswith('msgstr') and not entry.obsolete:
+                    span_start = entry.msgstr_span[0] if entry.msgstr_span else start
+                    entry.msgstr_span = (span_start, position)
+                    entry.newline = b'\r\n' if raw_line.endswith(b'\r\n') else b'\n'
+
+            if has_content:
+                yield self._finish(entry)
+
+    def _append(self, entry, field, value, reset=False):
+        if field.startswith('msgstr['):
+            index = int(field[7:-1])
+            entry.msgstr_plural[index] = ('' if reset else entry.msgstr_plural.get(index, '')) + value
+        else:
+            setattr(entry, field, ('' if reset else (getattr(entry, field) or '')) + value)
+
+    def _finish(self, entry):
+        # El header (msgid "") declara el charset del resto del archivo
+        if entry.msgid == '' and not entry.msgctxt:
+            match = re.search(r'charset=([\w-]+)', entry.msgstr)
+            if match:
+                # Las plantillas de xgettext traen charset=CHARSET: como polib,
+                # un charset desconocido se ignora y se sigue con UTF-8
+                try:
+                    self.encoding = codecs.lookup(match.group(1)).name
+                except LookupError:
+                    pass
+        return entry
+
+
+def parse_plural_forms(header, target_lang):
+    """
+    Obtiene el número de formas plurales y la expresión de selección del
+    header Plural-Forms (o del header completo del catálogo).
+
+    Args:
+        header (str): Valor de Plural-Forms o texto del header; puede ser None
+        target_lang (str): Idioma destino, para el valor por defecto
+
+    Returns:
+        tuple: (nplurals, expresión plural)
+    """
+    match = PLURAL_FORMS_RE.search(header or '')
+    if not match:
+        match = PLURAL_FORMS_RE.search(DEFAULT_PLURAL_FORMS.get(target_lang, 'nplurals=2; plural=(n != 1);'))
+    return int(match.group(1)), match.group(2).strip()
+
+
+def format_po_field(keyword, value, wrapwidth=78):
+    """
+    Genera las líneas de un campo .po (msgstr "...") con el mismo criterio de
+    cortes que polib: una línea por salto de línea y ajuste a wrapwidth.
+    """
+    lines = value.splitlines(True)
+    if len(lines) > 1:
+        lines = [''] + lines
+    elif len(polib.escape(value)) + len(keyword) + 3 > wrapwidth:
+        lines = [''] + [polib.unescape(item) for item in textwrap.wrap(
+            polib.escape(value), wrapwidth - 2, drop_whitespace=False, break_long_words=False
+        )]
+    else:
+        lines = [value]
+
+    result = [f'{keyword} "{polib.escape(lines.pop(0))}"']
+    result.extend(f'"{polib.escape(line)}"' for line in lines)
+    return result
+
+
+class POSplicer:
+    """
+    Escritor que copia el archivo .po original byte a byte y solo reemplaza
+    los rangos indicados. Escribe en un archivo temporal y lo mueve sobre el
+    original al terminar (reemplazo atómico).
+    """
+
+    def __init__(self, po_file_path, encoding='utf-8'):
+        self.po_file_path = Path(po_file_path)
+        self.encoding = encoding
+        self.position = 0
+        self.replacements = 0
+        self._source = open(self.po_file_path, 'rb')
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=self.po_file_path.parent, prefix=f'.{self.po_file_path.name}.', suffix='.tmp'
+        )
+        self._target = os.fdopen(fd, 'wb')
+
+    def _copy_until(self, offset):
+        self._source.seek(self.position)
+        remaining = offset - self.position
+        while remaining > 0:
+            chunk = self._source.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            self._target.write(chunk)
+            remaining -= len(chunk)
+        self.position = offset
+
+    def replace(self, span, lines, newline=b'\n'):
+        """
+        Reemplaza el rango (inicio, fin) del original por las líneas dadas.
+        Los reemplazos deben llegar en orden creciente de posición.
+        """
+        start, end = span
+        self._copy_until(start)
+        self._target.write(b''.join(line.encode(self.encoding) + newline for line in lines))
+        self.position = end
+        self.replacements += 1
+
+    def update_entry(self, entry, msgstr):
+        """
+        Escribe la traducción de una entrada y le quita el flag fuzzy. Para
+        entradas con plural, msgstr es la lista de formas (msgstr[0], ...).
+        """
+        if entry.fuzzy and entry.flags_span:
+            flags = [flag for flag in entry.flags if flag != 'fuzzy']
+            self.replace(entry.flags_span, [f"#, {', '.join(flags)}"] if flags else [], entry.newline)
+        if isinstance(msgstr, list):
+            lines = [line for index, form in enumerate(msgstr) for line in format_po_field(f'msgstr[{index}]', form)]
+        else:
+            lines = format_po_field('msgstr', msgstr)
+        self.replace(entry.msgstr_span, lines, entry.newline)
+
+    def commit(self):
+        """Copia el resto del original y reemplaza el archivo de forma atómica"""
+        self._copy_until(os.path.getsize(self.po_file_path))
+        self._source.close()
+        self._target.close()
+        shutil.copymode(str(self.po_file_path), self._tmp_path)
+        os.replace(self._tmp_path, self.po_file_path)
+
+    def abort(self):
+        """Descarta el archivo temporal sin tocar el original"""
+        self._source.close()
+        self._target.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class POBackupStore:
+    """
+    Almacén de backups de un archivo .po direccionado por contenido.
+
+    El archivo se corta en bloques definidos por contenido: un corte solo
+    puede caer en la línea en blanco que cierra una entrada, y se decide con
+    un hash de esa entrada. Editar unas pocas entradas cambia solo los
+    bloques que las contienen. Cada bloque se guarda comprimido en objects/
+    con su SHA-256 como nombre, y una versión es un manifiesto con la lista
+    de bloques. Todo se procesa en una pasada y con memoria acotada por el
+    tamaño máximo de bloque. Los objetos se comparten entre todos los .po
+    de la misma carpeta.
+    """
+
+    # Un bloque se cierra en ~1 de cada 16 entradas, nunca por debajo de
+    # CHUNK_MIN_SIZE y siempre al llegar a CHUNK_MAX_SIZE
+    CHUNK_MIN_SIZE = 16 * 1024
+    CHUNK_MAX_SIZE = 1024 * 1024
+    CHUNK_MASK = 0x0F
+
+    def __init__(self, po_file_path, keep=DEFAULT_BACKUP_KEEP):
+        self.po_file_path = Path(po_file_path)
+        self.backup_dir = self.po_file_path.parent / 'backups'
+        self.objects_dir = self.backup_dir / 'objects'
+        self.index_path = self.backup_dir / f'{self.po_file_path.name}.index.json'
+        self.keep = keep
+
+    def _load_index(self, index_path):
+        with open(index_path, encoding='utf-8') as f:
+            # Las entradas sin manifiesto son del formato anterior y no se pueden leer
+            return [version for version in json.load(f) if 'manifest' in version]
+
+    def versions(self):
+        """Lista de versiones guardadas, de la más antigua a la más reciente"""
+        if not self.index_path.exists():
+            return []
+        return self._load_index(self.index_path)
+
+    def _write_atomic(self, path, chunks):
+        """Escribe los bloques de bytes en un temporal y lo mueve sobre path"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            # mkstemp crea con 0600: los archivos nuevos toman los permisos del .po
+            mode_source = path if path.exists() else self.po_file_path
+            if mode_source.exists():
+                shutil.copymode(str(mode_source), tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _iter_chunks(self):
+        """Corta el archivo en bloques definidos por contenido (ver la clase)"""
+        chunk = []
+        chunk_size = 0
+        entry_hash = 0
+        with open(self.po_file_path, 'rb') as f:
+            for line in f:
+                chunk.append(line)
+                chunk_size += len(line)
+                if line.strip():
+                    entry_hash = zlib.crc32(line, entry_hash)
+                    boundary = False
+                else:
+                    boundary = chunk_size >= self.CHUNK_MIN_SIZE and not entry_hash & self.CHUNK_MASK
+                    entry_hash = 0
+                if boundary or chunk_size >= self.CHUNK_MAX_SIZE:
+                    yield b''.join(chunk)
+                    chunk, chunk_size = [], 0
+        if chunk:
+            yield b''.join(chunk)
+
+    def _object_path(self, name):
+        return self.objects_dir / name[:2] / name
+
+    def _store_object(self, name, payload):
+        """
+        Guarda un objeto comprimido si no existe (deduplicación por nombre).
+
+        Returns:
+            int: Bytes escritos (0 si el objeto ya existía)
+        """
+        path = self._object_path(name)
+        if path.exists():
+            return 0
+        data = zlib.compress(payload, 9)
+        self._write_atomic(path, [data])
+        return len(data)
+
+    def _load_object(self, name):
+        with open(self._object_path(name), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def _manifest(self, version):
+        return self._load_object(version['manifest']).decode('ascii').split()
+
+    def _iter_content(self, version):
+        """Contenido de una versión, bloque a bloque"""
+        for chunk_sha in self._manifest(version):
+            yield self._load_object(f'{chunk_sha}.zz')
+
+    def read(self, version):
+        """
+        Reconstruye el contenido de una versión.
+
+        Args:
+            version (dict): Entrada del índice
+
+        Returns:
+            bytes: Contenido del archivo en esa versión
+        """
+        content = b''.join(self._iter_content(version))
+        if hashlib.sha256(content).hexdigest() != version['sha256']:
+            raise ValueError(f"El backup de la versión {version['version']} está corrupto")
+        return content
+
+    def _save_index(self, versions):
+        data = json.dumps(versions, indent=2, ensure_ascii=False).encode('utf-8')
+        self._write_atomic(self.index_path, [data])
+
+    def save(self):
+        """
+        Guarda el contenido actual del archivo si cambió desde el último backup.
+
+        Returns:
+            tuple: (versión, creada) donde creada es False si no hubo cambios
+        """
+        digest = hashlib.sha256()
+        chunk_hashes = []
+        size = new_chunks = stored_bytes = 0
+        for chunk in self._iter_chunks():
+            digest.update(chunk)
+            size += len(chunk)
+            chunk_sha = hashlib.sha256(chunk).hexdigest()
+            chunk_hashes.append(chunk_sha)
+            written = self._store_object(f'{chunk_sha}.zz', chunk)
+            if written:
+                new_chunks += 1
+                stored_bytes += written
+        sha = digest.hexdigest()
+
+        versions = self.versions()
+        if versions and versions[-1]['sha256'] == sha:
+            return versions[-1], False
+
+        manifest = '\n'.join(chunk_hashes).encode('ascii')
+        manifest_name = f'{hashlib.sha256(manifest).hexdigest()}.manifest.zz'
+        stored_bytes += self._store_object(manifest_name, manifest)
+
+        version = {
+            'version': versions[-1]['version'] + 1 if versions else 1,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'sha256': sha,
+            'size': size,
+            'manifest': manifest_name,
+            'chunks': len(chunk_hashes),
+            'new_chunks': new_chunks,
+            'stored_bytes': stored_bytes,
+        }
+        versions.append(version)
+        if self.keep:
+            # Retención: los bloques que solo usaban las versiones desalojadas
+            # los elimina _collect_garbage
+            del versions[:-self.keep]
+        self._save_index(versions)
+        self._collect_garbage()
+        return version, True
+
+    def _collect_garbage(self):
+        """Elimina los objetos que ya no referencia ningún índice de la carpeta"""
+        referenced = set()
+        for index_path in self.backup_dir.glob('*.index.json'):
+            for version in self._load_index(index_path):
+                if version['manifest'] not in referenced:
+                    referenced.add(version['manifest'])
+                    referenced.update(f'{chunk_sha}.zz' for chunk_sha in self._manifest(version))
+        for path in self.objects_dir.glob('*/*.zz'):
+            if path.name not in referenced:
+                path.unlink()
+
+    def find(self, ref):
+        """
+        Busca una versión por número, prefijo de SHA-256 o 'latest'.
+
+        Returns:
+            dict: Entrada del índice
+        """
+        versions = self.versions()
+        if not versions:
+            raise ValueError(f"No hay backups de {self.po_file_path}")
+        ref = str(ref)
+        if ref == 'latest':
+            return versions[-1]
+        if ref.isdigit():
+            for version in versions:
+                if version['version'] == int(ref):
+                    return version
+        else:
+            matches = [v for v in versions if v['sha256'].startswith(ref)]
+            if len(matches) == 1:
+                return matches[0]
+        raise ValueError(f"Versión '{ref}' no encontrada en los backups de {self.po_file_path}")
+
+    def restore(self, ref):
+        """
+        Restaura el archivo a una versión guardada. El contenido actual se
+        respalda antes, de modo que la restauración también se puede deshacer.
+
+        Returns:
+            dict: Versión restaurada
+        """
+        version = self.find(ref)
+
+        def verified_content():
+            digest = hashlib.sha256()
+            for chunk in self._iter_content(version):
+                digest.update(chunk)
+                yield chunk
+            if digest.hexdigest() != version['sha256']:
+                raise ValueError(f"El backup de la versión {version['version']} está corrupto")
+
+        # Se reconstruye antes del backup del contenido actual, que puede desalojar la versión
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.po_file_path.parent, prefix=f'.{self.po_file_path.name}.', suffix='.tmp'
+        )
+        os.close(fd)
+        try:
+            self._write_atomic(Path(tmp_path), verified_content())
+            if self.po_file_path.exists():
+                self.save()
+                shutil.copymode(str(self.po_file_path), tmp_path)
+            os.replace(tmp_path, self.po_file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return version
+
+
+def find_po_files(locale_path):
+    """Catálogos django.po de una carpeta locale (a cualquier profundidad)"""
+    return sorted(Path(locale_path).glob('**/django.po'))
+
+
+def compile_mo_file(po_file_path):
+    """
+    Compila un .po a .mo junto a él. El .mo se escribe en un archivo temporal
+    que reemplaza al anterior de forma atómica, así un servidor en ejecución
+    nunca lee un catálogo a medio escribir.
+
+    Args:
+        po_file_path (str): Ruta del archivo .po
+
+    Returns:
+        tuple: (ruta del .mo, número de entradas traducidas compiladas)
+    """
+    po_file_path = Path(po_file_path)
+    mo_file_path = po_file_path.with_suffix('.mo')
+    po = polib.pofile(str(po_file_path))
+
+    fd, tmp_path = tempfile.mkstemp(dir=po_file_path.parent, prefix=f'.{mo_file_path.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        po.save_as_mofile(tmp_path)
+        shutil.copymode(str(mo_file_path if mo_file_path.exists() else po_file_path), tmp_path)
+        os.replace(tmp_path, mo_file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return str(mo_file_path), len(po.translated_entries())
+
+
+def compile_catalogs(po_files, workers=None):
+    """
+    Compila varios catálogos .po a .mo en procesos paralelos.
+
+    Args:
+        po_files (list): Rutas de los archivos .po
+        workers (int): Número de procesos (default: número de CPUs)
+
+    Returns:
+        bool: True si todos los catálogos se compilaron correctamente
+    """
+    if not po_files:
+        print("✅ No hay catálogos modificados que compilar")
+        return True
+
+    print(f"\n🔨 Compilando {len(po_files)} catálogo(s) modificado(s)...")
+    success = True
+    workers = max(1, min(workers or os.cpu_count() or 1, len(po_files)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(compile_mo_file, str(po_file)): po_file for po_file in po_files}
+        for future in as_completed(futures):
+            try:
+                mo_file_path, compiled = future.result()
+                print(f"  ✅ {mo_file_path} ({compiled} entradas)")
+            except Exception as e:
+                success = False
+                print(f"  ❌ Error compilando {futures[future]}: {e}")
+    return success
+
 
 class POTranslator:
     """
     Traductor eficiente de archivos .po usando DeepSeek API
     """
 
-    def __init__(self, api_key=None):
+    # Reintentos individuales de una entrada con plural rechazada
+    PLURAL_RETRIES = 2
+
+    def __init__(self, api_key=None, backup_keep=DEFAULT_BACKUP_KEEP):
         """
         Inicializa el traductor con la API de DeepSeek
 
         Args:
             api_key: Clave API de DeepSeek (opcional, usa variable de entorno si no se proporciona)
+            backup_keep: Versiones de cada .po que se conservan en los backups
         """
+        self.backup_keep = backup_keep
+        # Catálogos modificados en esta ejecución (para compilar solo esos)
+        self.changed_files = []
         self.api_key = api_key or os.environ.get("DEEPSEEK_API_KEY")
         if not self.api_key:
             raise ValueError("Se requiere DEEPSEEK_API_KEY. Proporciona la clave o configura la variable de entorno.")
@@ -238,6 +794,108 @@ Rules:
             print(f"❌ Error al traducir texto simple: {e}")
             return None
 
+    def _request_plural_forms(self, entries, plural_forms, target_lang, source_lang='es'):
+        """
+        Pide en una sola llamada las formas plurales de varias entradas.
+
+        Returns:
+            list: Formas por entrada, o None si la respuesta no trae
+            exactamente nplurals formas válidas para esa entrada
+        """
+        nplurals, plural_expr = plural_forms
+        lang_names = {
+            'en': 'English',
+            'pt': 'Portuguese (Brazil)'
+        }
+        target_lang_name = lang_names.get(target_lang, target_lang)
+
+        items = [
+            {"id": i, "singular": entry.msgid, "plural": entry.msgid_plural}
+            for i, entry in enumerate(entries, 1)
+        ]
+
+        system_prompt = """Eres un traductor profesional especializado en contenido web empresarial.
+Traduce con precisión manteniendo el contexto y significado original.
+Preserva nombres propios, marcas, nombres de lugares, términos técnicos y acrónimos."""
+
+        user_prompt = f"""
+Traduce estas entradas con plural del español a {target_lang_name}.
+
+El idioma destino usa {nplurals} formas plurales, elegidas con la expresión gettext
+plural={plural_expr}: la forma i se usa cuando la expresión vale i para la cantidad n.
+
+{json.dumps(items, ensure_ascii=False, indent=2)}
+
+Reglas:
+- Devuelve EXACTAMENTE {nplurals} formas por entrada, en orden (forma 0, forma 1, ...)
+- Preserva variables y placeholders sin modificar (%(count)s, %d, {{n}}, etc.)
+- Preserva TODAS las etiquetas HTML sin modificar
+- NO traduzcas nombres propios de personas, lugares, empresas o marcas
+- Devuelve SOLO un objeto JSON, sin explicaciones
+
+Formato:
+{{"1": ["forma 0", "forma 1"], "2": ["forma 0", "forma 1"]}}
+"""
+
+        try:
+            message = self.client.chat.completions.create(
+                model="deepseek-chat",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=4000,
+                timeout=90
+            )
+
+            content = message.choices[0].message.content
+            data = json.loads(content[content.index('{'):content.rindex('}') + 1])
+        except Exception as e:
+            print(f"❌ Error al traducir entradas con plural: {e}")
+            return [None] * len(entries)
+
+        results = []
+        for i, entry in enumerate(entries, 1):
+            forms = data.get(str(i))
+            original_text = max(entry.msgid, entry.msgid_plural, key=len)
+            valid = (
+                isinstance(forms, list) and
+                len(forms) == nplurals and
+                all(isinstance(form, str) and self._is_valid_translation(form, original_text) for form in forms)
+            )
+            results.append([form.strip() for form in forms] if valid else None)
+        return results
+
+    def translate_plural_entries(self, entries, plural_forms, target_lang, source_lang='es'):
+        """
+        Traduce un lote de entradas con plural (msgid_plural) en una sola
+        petición. Las entradas cuya respuesta no trae exactamente nplurals
+        formas se rechazan y se piden de nuevo una a una, hasta
+        PLURAL_RETRIES veces.
+
+        Args:
+            entries (list): Entradas con msgid_plural
+            plural_forms (tuple): (nplurals, expresión plural) del catálogo
+            target_lang (str): Código de idioma destino
+            source_lang (str): Código de idioma origen
+
+        Returns:
+            list: Lista de formas por entrada (None si no se pudo traducir)
+        """
+        if not entries:
+            return []
+
+        results = self._request_plural_forms(entries, plural_forms, target_lang, source_lang)
+        for i, entry in enumerate(entries):
+            for attempt in range(1, self.PLURAL_RETRIES + 1):
+                if results[i] is not None:
+                    break
+                print(f"  ↩️  Formas plurales rechazadas, reintentando individualmente "
+                      f"({attempt}/{self.PLURAL_RETRIES}): {entry.msgid[:60]}...")
+                results[i] = self._request_plural_forms([entry], plural_forms, target_lang, source_lang)[0]
+        return results
+
     def translate_text_smart(self, text, target_lang, source_lang='es'):
         """
         Traduce texto de forma inteligente: detecta si tiene HTML y usa el método apropiado.
@@ -349,26 +1007,58 @@ Rules:
 
     def create_backup(self, file_path):
         """
-        Crea un backup del archivo .po
+        Crea un backup del archivo .po en el almacén de backups. Si el
+        contenido no cambió desde el último backup no se guarda nada.
 
         Args:
             file_path (Path): Ruta del archivo
 
         Returns:
-            Path: Ruta del backup creado
+            dict: Versión del backup correspondiente al contenido actual
         """
-        backup_dir = file_path.parent / "backups"
-        backup_dir.mkdir(exist_ok=True)
+        store = POBackupStore(file_path, keep=self.backup_keep)
+        version, created = store.save()
+        if created:
+            print(f"✅ Backup creado: versión {version['version']} ({version['new_chunks']} de "
+                  f"{version['chunks']} bloques nuevos) en {store.backup_dir}")
+        else:
+            print(f"✅ Backup sin cambios: el contenido ya está en la versión {version['version']}")
+        return version
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{file_path.stem}_backup_{timestamp}.po"
-        backup_path = backup_dir / backup_name
+    def needs_translation(self, entry):
+        """
+        Determina si una entrada (de polib o de StreamingPOReader) necesita traducción.
 
-        shutil.copy2(str(file_path), str(backup_path))
-        print(f"✅ Backup creado: {backup_path}")
-        return backup_path
+        Args:
+            entry: Entrada del archivo .po
 
-    def translate_po_file(self, po_file_path, batch_size=10, dry_run=False):
+        Returns:
+            bool: True si debe traducirse, False en caso contrario
+        """
+        if entry.obsolete:
+            return False
+
+        # Traducir si:
+        # 1. No tiene traducción (msgstr vacío, o alguna forma plural vacía)
+        # 2. Es fuzzy
+        # 3. La traducción es igual al original (probablemente incorrecta)
+        if entry.msgid_plural:
+            forms = [entry.msgstr_plural[index] for index in sorted(entry.msgstr_plural)]
+            needs_translation = (
+                not forms or not all(forms) or
+                entry.fuzzy or
+                forms[0] == entry.msgid
+            )
+        else:
+            needs_translation = (
+                not entry.msgstr or
+                entry.fuzzy or
+                entry.msgstr == entry.msgid
+            )
+
+        return needs_translation and self.should_translate(entry.msgid)
+
+    def translate_po_file(self, po_file_path, batch_size=10, dry_run=False, stream=False):
         """
         Traduce un archivo .po completo.
 
@@ -376,6 +1066,7 @@ Rules:
             po_file_path (str|Path): Ruta al archivo .po
             batch_size (int): Número de entradas a procesar por lote
             dry_run (bool): Si es True, solo muestra qué se traduciría sin hacer cambios
+            stream (bool): Si es True, usa el modo streaming de baja memoria
 
         Returns:
             bool: True si se procesó correctamente, False en caso contrario
@@ -398,35 +1089,24 @@ Rules:
         print(f"\n{'='*80}")
         print(f"📁 Procesando: {po_file_path}")
         print(f"🌐 Idioma destino: {target_lang}")
-        print(f"🔧 Modo: {'DRY-RUN (simulación)' if dry_run else 'PRODUCCIÓN'}")
+        print(f"🔧 Modo: {'DRY-RUN (simulación)' if dry_run else 'PRODUCCIÓN'}"
+              f"{' · STREAMING' if stream else ''}")
         print(f"{'='*80}\n")
 
         # Crear backup si no es dry-run
         if not dry_run:
             self.create_backup(po_file_path)
 
+        if stream:
+            return self._translate_po_file_streaming(po_file_path, target_lang, batch_size, dry_run)
+
         try:
             # Cargar el archivo .po
             po = polib.pofile(str(po_file_path))
 
             # Filtrar entradas que necesitan traducción
-            entries_to_translate = []
-            for entry in po:
-                if entry.obsolete:
-                    continue
-
-                # Traducir si:
-                # 1. No tiene traducción (msgstr vacío)
-                # 2. Es fuzzy
-                # 3. La traducción es igual al original (probablemente incorrecta)
-                needs_translation = (
-                    not entry.msgstr or
-                    entry.fuzzy or
-                    entry.msgstr == entry.msgid
-                )
-
-                if needs_translation and self.should_translate(entry.msgid):
-                    entries_to_translate.append(entry)
+            entries_to_translate = [entry for entry in po if self.needs_translation(entry)]
+            plural_forms = parse_plural_forms(po.metadata.get('Plural-Forms'), target_lang)
 
             total_entries = len(entries_to_translate)
 
@@ -449,12 +1129,33 @@ Rules:
                 print(f"\n🔄 Lote {batch_num}/{total_batches} ({len(batch)} entradas)")
                 print("-" * 80)
 
+                # Las entradas con plural del lote se traducen juntas en una petición
+                plural_entries = [entry for entry in batch if entry.msgid_plural]
+                plural_translations = {}
+                if plural_entries and not dry_run:
+                    print(f"  🔄 Traduciendo {len(plural_entries)} entradas con plural "
+                          f"({plural_forms[0]} formas)...")
+                    results = self.translate_plural_entries(plural_entries, plural_forms, target_lang)
+                    plural_translations = {id(entry): forms for entry, forms in zip(plural_entries, results)}
+
                 for entry in batch:
                     try:
                         original_text = entry.msgid
 
                         if dry_run:
-                            print(f"  🔍 [{translated_count + 1}/{total_entries}] Original: {original_text[:80]}...")
+                            print(f"  🔍 [{translated_count + 1}/{total_entries}] Original: {original_text[:80]}..."
+                                  f"{' (plural)' if entry.msgid_plural else ''}")
+                        elif entry.msgid_plural:
+                            forms = plural_translations.get(id(entry))
+
+                            if forms:
+                                entry.msgstr_plural = dict(enumerate(forms))
+                                entry.fuzzy = False  # Quitar el flag fuzzy
+                                translated_count += 1
+                                print(f"  ✅ Traducido (plural): {' | '.join(forms)[:80]}...")
+                            else:
+                                error_count += 1
+                                print(f"  ⚠️  No se pudo traducir (plural): {original_text[:80]}...")
                         else:
                             print(f"  🔄 [{translated_count + 1}/{total_entries}] Traduciendo: {original_text[:80]}...")
 
@@ -477,6 +1178,7 @@ Rules:
             # Guardar el archivo si no es dry-run
             if not dry_run and translated_count > 0:
                 po.save(str(po_file_path))
+                self.changed_files.append(po_file_path)
                 print(f"\n💾 Archivo guardado: {po_file_path}")
 
             print(f"\n{'='*80}")
@@ -495,7 +1197,126 @@ Rules:
             traceback.print_exc()
             return False
 
-    def translate_locale_folder(self, locale_path='locale', batch_size=10, dry_run=False):
+    def _translate_po_file_streaming(self, po_file_path, target_lang, batch_size, dry_run):
+        """
+        Traduce un archivo .po sin cargar el catálogo en memoria.
+
+        Recorre el archivo con StreamingPOReader y, a medida que se completa
+        cada lote de entradas pendientes, escribe sus msgstr traducidos con
+        POSplicer. Las entradas que no se tocan se copian byte a byte, por lo
+        que la memoria depende del tamaño del lote y no del catálogo.
+
+        Returns:
+            bool: True si se procesó correctamente, False en caso contrario
+        """
+        reader = StreamingPOReader(po_file_path)
+        splicer = None if dry_run else POSplicer(po_file_path)
+
+        pending_count = 0
+        translated_count = 0
+        error_count = 0
+        batch_num = 0
+
+        plural_forms = parse_plural_forms(None, target_lang)
+
+        def process_batch(batch):
+            nonlocal translated_count, error_count, batch_num
+            batch_num += 1
+            print(f"\n🔄 Lote {batch_num} ({len(batch)} entradas)")
+            print("-" * 80)
+
+            # Las entradas con plural del lote se traducen juntas en una petición
+            plural_entries = [entry for entry in batch if entry.msgid_plural]
+            plural_translations = {}
+            if plural_entries and not dry_run:
+                print(f"  🔄 Traduciendo {len(plural_entries)} entradas con plural "
+                      f"({plural_forms[0]} formas)...")
+                results = self.translate_plural_entries(plural_entries, plural_forms, target_lang)
+                plural_translations = {id(entry): forms for entry, forms in zip(plural_entries, results)}
+
+            # Los reemplazos se escriben en el orden del archivo
+            for entry in batch:
+                try:
+                    if dry_run:
+                        print(f"  🔍 Original: {entry.msgid[:80]}...{' (plural)' if entry.msgid_plural else ''}")
+                        continue
+
+                    if entry.msgid_plural:
+                        translation = plural_translations.get(id(entry))
+                    else:
+                        print(f"  🔄 Traduciendo: {entry.msgid[:80]}...")
+                        translation = self.translate_text_smart(entry.msgid, target_lang)
+
+                    if translation:
+                        splicer.encoding = reader.encoding
+                        splicer.update_entry(entry, translation)
+                        translated_count += 1
+                        if entry.msgid_plural:
+                            print(f"  ✅ Traducido (plural): {' | '.join(translation)[:80]}...")
+                        else:
+                            print(f"  ✅ Traducido: {translation[:80]}...")
+                    else:
+                        error_count += 1
+                        print(f"  ⚠️  No se pudo traducir{' (plural)' if entry.msgid_plural else ''}: "
+                              f"{entry.msgid[:80]}...")
+
+                except Exception as e:
+                    error_count += 1
+                    print(f"  ❌ Error: {e}")
+
+        try:
+            print(f"📦 Procesando en streaming, lotes de {batch_size}")
+
+            batch = []
+            for entry in reader:
+                # El header declara las formas plurales del idioma destino
+                if entry.msgid == '' and not entry.msgctxt and not entry.obsolete:
+                    plural_forms = parse_plural_forms(entry.msgstr, target_lang)
+                    continue
+
+                if not self.needs_translation(entry):
+                    continue
+
+                batch.append(entry)
+                pending_count += 1
+                if len(batch) >= batch_size:
+                    process_batch(batch)
+                    batch = []
+
+            if batch:
+                process_batch(batch)
+
+            if pending_count == 0:
+                print("✅ No hay entradas que necesiten traducción")
+
+            # Guardar el archivo si no es dry-run
+            if splicer and translated_count > 0:
+                splicer.commit()
+                self.changed_files.append(po_file_path)
+                print(f"\n💾 Archivo guardado: {po_file_path}")
+            elif splicer:
+                splicer.abort()
+
+            print(f"\n{'='*80}")
+            print(f"✅ Proceso completado")
+            print(f"📊 Estadísticas:")
+            print(f"   - Total procesadas: {pending_count}")
+            print(f"   - Traducidas exitosamente: {translated_count}")
+            print(f"   - Errores: {error_count}")
+            print(f"{'='*80}\n")
+
+            return True
+
+        except Exception as e:
+            if splicer:
+                splicer.abort()
+            print(f"❌ Error procesando archivo: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+    def translate_locale_folder(self, locale_path='locale', batch_size=10, dry_run=False, stream=False,
+                                compile_mo=False, compile_workers=None):
         """
         Traduce todos los archivos .po en la carpeta locale.
 
@@ -503,6 +1324,9 @@ Rules:
             locale_path (str): Ruta a la carpeta locale
             batch_size (int): Número de entradas a procesar por lote
             dry_run (bool): Si es True, solo muestra qué se traduciría
+            stream (bool): Si es True, usa el modo streaming de baja memoria
+            compile_mo (bool): Si es True, compila a .mo los catálogos modificados
+            compile_workers (int): Número de procesos para la compilación
 
         Returns:
             bool: True si todos los archivos se procesaron correctamente
@@ -514,7 +1338,7 @@ Rules:
             return False
 
         # Buscar archivos .po
-        po_files = list(locale_path.glob('**/django.po'))
+        po_files = find_po_files(locale_path)
 
         if not po_files:
             print(f"❌ No se encontraron archivos django.po en: {locale_path}")
@@ -531,13 +1355,43 @@ Rules:
 
         success = True
         for po_file in po_files:
-            result = self.translate_po_file(po_file, batch_size=batch_size, dry_run=dry_run)
+            result = self.translate_po_file(po_file, batch_size=batch_size, dry_run=dry_run, stream=stream)
             if not result:
                 success = False
 
+        if compile_mo and not dry_run:
+            if not self.compile_changed(workers=compile_workers):
+                success = False
+
         return success
 
 
+    def compile_changed(self, workers=None):
+        """
+        Compila a .mo solo los catálogos que se modificaron en esta ejecución.
+
+        Args:
+            workers (int): Número de procesos (default: número de CPUs)
+
+        Returns:
+            bool: True si todos los catálogos se compilaron correctamente
+        """
+        po_files = list(dict.fromkeys(Path(po_file) for po_file in self.changed_files))
+        return compile_catalogs(po_files, workers=workers)
+
+
+def list_backups(store):
+    """Muestra las versiones guardadas de un archivo .po"""
+    versions = store.versions()
+    print(f"\n📁 {store.po_file_path}")
+    if not versions:
+        print("   (sin backups)")
+        return
+    for version in versions:
+        print(f"   v{version['version']:<4} {version['timestamp']}  {version['sha256'][:12]}  "
+              f"{version['size']:>10} bytes  {version['new_chunks']}/{version['chunks']} bloques nuevos")
+
+
 def main():
     """Función principal del script"""
     import argparse
@@ -560,8 +1414,18 @@ Ejemplos de uso:
   # Usar lotes más grandes para mayor velocidad (default: 10)
   python po_translator.py --batch-size 20
 
+  # Catálogos muy grandes: modo streaming de baja memoria
+  python po_translator.py --file locale/en/LC_MESSAGES/django.po --stream
+
   # Especificar API key directamente
   python po_translator.py --api-key sk-xxxxx
+
+  # Compilar a .mo solo los catálogos modificados (en lugar de compilemessages)
+  python po_translator.py --compile
+
+  # Ver los backups de un archivo y restaurar una versión
+  python po_translator.py --file locale/en/LC_MESSAGES/django.po --list-backups
+  python po_translator.py --file locale/en/LC_MESSAGES/django.po --restore 3
         """
     )
 
@@ -597,30 +1461,95 @@ Ejemplos de uso:
         help='Clave API de DeepSeek (también se puede usar DEEPSEEK_API_KEY env var)'
     )
 
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Modo streaming de baja memoria para catálogos muy grandes: '
+             'solo reescribe los msgstr traducidos y copia el resto byte a byte'
+    )
+
     parser.add_argument(
         '--retry-failed',
         action='store_true',
         help='Reintentar traducir solo las entradas que fallaron previamente'
     )
 
+    parser.add_argument(
+        '--compile',
+        action='store_true',
+        help='Compilar a .mo, en paralelo y de forma atómica, solo los catálogos modificados'
+    )
+
+    parser.add_argument(
+        '--compile-workers',
+        type=int,
+        help='Procesos para la compilación de .mo (default: número de CPUs)'
+    )
+
+    parser.add_argument(
+        '--backup-keep',
+        type=int,
+        default=DEFAULT_BACKUP_KEEP,
+        help=f'Versiones de cada .po que se conservan en los backups, 0 = sin límite '
+             f'(default: {DEFAULT_BACKUP_KEEP})'
+    )
+
+    parser.add_argument(
+        '--list-backups',
+        action='store_true',
+        help='Listar las versiones guardadas en los backups y salir'
+    )
+
+    parser.add_argument(
+        '--restore',
+        metavar='VERSION',
+        help='Restaurar --file a una versión de los backups (número, prefijo de SHA-256 o "latest")'
+    )
+
     args = parser.parse_args()
 
+    if args.restore and not args.file:
+        parser.error('--restore requiere --file')
+
     try:
+        # Backups: no requieren API key
+        if args.list_backups:
+            po_files = [Path(args.file)] if args.file else find_po_files(args.locale_path)
+            for po_file in po_files:
+                list_backups(POBackupStore(po_file, keep=args.backup_keep))
+            sys.exit(0)
+
+        if args.restore:
+            store = POBackupStore(args.file, keep=args.backup_keep)
+            try:
+                version = store.restore(args.restore)
+            except ValueError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            print(f"✅ {args.file} restaurado a la versión {version['version']} ({version['timestamp']})")
+            sys.exit(0)
+
         # Inicializar el traductor
-        translator = POTranslator(api_key=args.api_key)
+        translator = POTranslator(api_key=args.api_key, backup_keep=args.backup_keep)
 
         # Procesar archivo(s)
         if args.file:
             success = translator.translate_po_file(
                 args.file,
                 batch_size=args.batch_size,
-                dry_run=args.dry_run
+                dry_run=args.dry_run,
+                stream=args.stream
             )
+            if args.compile and not args.dry_run:
+                success = translator.compile_changed(workers=args.compile_workers) and success
         else:
             success = translator.translate_locale_folder(
                 locale_path=args.locale_path,
                 batch_size=args.batch_size,
-                dry_run=args.dry_run
+                dry_run=args.dry_run,
+                stream=args.stream,
+                compile_mo=args.compile,
+                compile_workers=args.compile_workers
             )
 
         sys.exit(0 if success else 1)
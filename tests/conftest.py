@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los scripts no son un paquete: se importan directamente desde scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
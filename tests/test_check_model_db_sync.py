@@ -0,0 +1,222 @@
+"""
+Tests de check_model_db_sync.py contra un proyecto Django sintético en SQLite.
+
+El proyecto se genera con los helpers de bench_model_db_sync.py: se crea el
+esquema sin drift y luego se reescriben los modelos con drift conocido
+(ver generate_model). Django se configura una sola vez por proceso, por eso
+cada verificación corre en un subproceso con el proyecto como cwd.
+
+Las reglas de costo de PostgreSQL no necesitan base de datos: se prueban
+directamente con diccionarios de estadísticas.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('django')
+
+import bench_model_db_sync as bench
+import check_model_db_sync as sync
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'check_model_db_sync.py'
+
+N_MODELS = 10
+
+
+def run(args, project, extra_paths):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='bench_project.settings',
+               PYTHONPATH=os.pathsep.join([str(project), *map(str, extra_paths)]))
+    return subprocess.run([sys.executable, *args], cwd=project, env=env,
+                          capture_output=True, text=True)
+
+
+@pytest.fixture(scope='module')
+def drift_project(tmp_path_factory):
+    base = tmp_path_factory.mktemp('sync')
+    project = base / 'project'
+    bench.write_project(project, N_MODELS, {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(project / 'db.sqlite3'),
+    })
+
+    # Una app "de terceros" dentro de site-packages y otra fuera del proyecto
+    third_party = project / 'venv' / 'lib' / 'site-packages'
+    outside = base / 'outside'
+    for path, label in ((third_party, 'thirdparty_app'), (outside, 'external_app')):
+        (path / label).mkdir(parents=True)
+        (path / label / '__init__.py').write_text('')
+    with open(project / 'bench_project' / 'settings.py', 'a') as settings:
+        settings.write("INSTALLED_APPS += ['thirdparty_app', 'external_app']\n")
+    extra_paths = [third_party, outside]
+
+    migrate = run(['-c', bench.SETUP_SCHEMA_CODE.format(schema=None)], project, extra_paths)
+    assert migrate.returncode == 0, migrate.stderr
+
+    (project / bench.APP_LABEL / 'models.py').write_text(
+        bench.generate_models_source(N_MODELS, drift=True)
+    )
+    return project, extra_paths
+
+
+@pytest.fixture(scope='module')
+def results(drift_project):
+    project, extra_paths = drift_project
+    completed = run([str(SCRIPT), '--format', 'json'], project, extra_paths)
+    assert completed.returncode == 1, completed.stderr
+    report = json.loads(completed.stdout)
+    return {result['model']: result for result in report['results']}
+
+
+def test_discover_project_apps_excludes_django_and_third_party(drift_project):
+    project, extra_paths = drift_project
+    completed = run(['-c', (
+        "import sys; sys.path.insert(0, %r)\n"
+        "import check_model_db_sync as sync\n"
+        "sync.setup_django()\n"
+        "print(' '.join(app.label for app in sync.discover_project_apps()))\n"
+    ) % str(SCRIPT.parent)], project, extra_paths)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.split() == [bench.APP_LABEL]
+
+
+def test_synced_model_is_ok(results):
+    assert results['Model0']['status'] == 'ok'
+
+
+def test_missing_table(results):
+    assert results['Extra0']['status'] == 'missing_table'
+
+
+def test_type_mismatch(results):
+    result = results['Model1']
+    assert result['status'] == 'mismatch'
+    assert result['type_changes'] == [
+        {'field': 'name', 'db_type': 'varchar(50)', 'model_type': 'varchar(80)'}
+    ]
+
+
+def test_extra_column_in_db(results):
+    assert results['Model2']['missing_in_model'] == ['notes']
+
+
+def test_missing_column_in_db(results):
+    assert results['Model3']['missing_in_db'] == ['external_id']
+
+
+def test_missing_index(results):
+    missing = [index['columns'] for index in results['Model4']['missing_indexes']]
+    assert missing == [['created']]
+
+
+def test_sqlite_costs_do_not_use_postgres_rules(results):
+    [operation] = results['Model1']['operations']
+    assert operation['strategy'] == 'rebuild'
+    assert 'ACCESS EXCLUSIVE' not in operation['lock']
+
+
+def test_expected_drift_counts(results):
+    statuses = [result['status'] for result in results.values()]
+    expected = bench.expected_drift(N_MODELS)
+    assert {status: statuses.count(status) for status in expected} == expected
+
+
+STATS = {'rows': 1_000_000, 'pages': 10_000, 'bytes': 80_000_000}
+
+
+def missing_field(column, default_kind=None, field_type='CharField', null=False, unique=False):
+    return {'column': column, 'default_kind': default_kind, 'field_type': field_type,
+            'null': null, 'unique': unique}
+
+
+def pg_costs(missing_fields=(), type_changes=(), missing_indexes=(), stats=STATS):
+    return sync.estimate_migration_costs('big_table', list(missing_fields), list(type_changes),
+                                         list(missing_indexes), stats)
+
+
+@pytest.mark.parametrize('current, new, expected', [
+    ('varchar(50)', 'varchar(80)', True),
+    ('character varying(50)', 'varchar(50)', True),
+    ('varchar(80)', 'varchar(50)', False),
+    ('varchar(50)', 'text', True),
+    ('varchar(50)', 'varchar', True),
+    ('varchar', 'varchar(50)', False),
+    ('numeric(10,2)', 'numeric(12,2)', True),
+    ('numeric(10,2)', 'numeric(12,4)', False),
+    ('numeric(10,2)', 'numeric(8,2)', False),
+    ('numeric(10,2)', 'numeric', True),
+    ('integer', 'bigint', False),
+    ('text', 'varchar(50)', False),
+])
+def test_is_metadata_only_type_change(current, new, expected):
+    assert sync.is_metadata_only_type_change(current, new) is expected
+
+
+@pytest.mark.parametrize('field, strategy', [
+    (missing_field('notes', null=True), 'metadata'),
+    (missing_field('status', default_kind='constant'), 'metadata'),
+    (missing_field('code'), 'metadata'),
+    (missing_field('token', default_kind='volatile'), 'rewrite'),
+    (missing_field('seq', field_type='BigAutoField'), 'rewrite'),
+])
+def test_postgres_add_column_strategy(field, strategy):
+    [operation] = pg_costs(missing_fields=[field])
+    assert operation['strategy'] == strategy
+    assert operation['lock'] == sync.MIGRATION_STRATEGIES[strategy][1]
+    assert operation['io_pages'] == {'metadata': 0, 'rewrite': 2 * STATS['pages']}[strategy]
+
+
+def test_postgres_volatile_default_recommends_backfill():
+    [operation] = pg_costs(missing_fields=[missing_field('token', default_kind='volatile')])
+    assert 'por lotes' in operation['recommendation']
+
+
+def test_postgres_type_change_strategy():
+    operations = {op['column']: op for op in pg_costs(type_changes=[
+        {'field': 'name', 'db_type': 'varchar(50)', 'model_type': 'varchar(80)'},
+        {'field': 'id', 'db_type': 'integer', 'model_type': 'bigint'},
+    ])}
+    assert operations['name']['strategy'] == 'metadata'
+    assert operations['id']['strategy'] == 'rewrite'
+
+
+def test_postgres_indexes_recommend_concurrently():
+    operations = {op['column']: op for op in pg_costs(missing_indexes=[
+        {'columns': ['created'], 'unique': False},
+        {'columns': ['email', 'site_id'], 'unique': True},
+    ])}
+
+    plain, unique = operations['created'], operations['email, site_id']
+    assert plain['strategy'] == unique['strategy'] == 'index_build'
+    assert plain['io_pages'] == STATS['pages']
+    assert 'AddIndexConcurrently' in plain['recommendation']
+    assert 'CREATE UNIQUE INDEX CONCURRENTLY' in unique['recommendation']
+    assert 'USING INDEX' in unique['recommendation']
+
+
+def test_postgres_costs_sorted_by_lock_then_io():
+    operations = pg_costs(
+        missing_fields=[missing_field('notes', null=True),
+                        missing_field('token', default_kind='volatile')],
+        type_changes=[{'field': 'id', 'db_type': 'integer', 'model_type': 'bigint'}],
+        missing_indexes=[{'columns': ['created'], 'unique': False}],
+    )
+    assert [op['strategy'] for op in operations] == ['rewrite', 'rewrite', 'index_build', 'metadata']
+
+    # Mismo bloqueo: decide el IO estimado de cada tabla
+    small = sync.estimate_migration_costs('small', [], [], [{'columns': ['a'], 'unique': False}],
+                                          {'rows': 10, 'pages': 1, 'bytes': 8192})
+    big = pg_costs(missing_indexes=[{'columns': ['b'], 'unique': False}])
+    ordered = sorted(small + big, key=sync.operation_cost_key, reverse=True)
+    assert [op['table'] for op in ordered] == ['big_table', 'small']
+
+
+def test_postgres_costs_without_stats():
+    [operation] = pg_costs(missing_fields=[missing_field('token', default_kind='volatile')],
+                           stats={'rows': None, 'pages': None, 'bytes': None})
+    assert operation['io_pages'] is None
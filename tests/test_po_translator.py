@@ -0,0 +1,264 @@
+"""Tests de po_translator.py"""
+
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('polib')
+pytest.importorskip('openai')
+
+from po_translator import POBackupStore, POTranslator, StreamingPOReader
+
+
+def write_po(path, n_entries, translated=(), inserted=()):
+    lines = ['msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n\n']
+    for i in range(n_entries):
+        if i in inserted:
+            lines.append(f'msgid "nuevo {i}"\nmsgstr ""\n\n')
+        msgstr = f'texto {i} en inglés' if i in translated else ''
+        lines.append(f'msgid "texto {i}"\nmsgstr "{msgstr}"\n\n')
+    path.write_text(''.join(lines), encoding='utf-8')
+    return path.read_bytes()
+
+
+@pytest.fixture
+def po_file(tmp_path):
+    path = tmp_path / 'locale' / 'en' / 'LC_MESSAGES' / 'django.po'
+    path.parent.mkdir(parents=True)
+    return path
+
+
+def assert_all_versions_readable(store):
+    for version in store.versions():
+        assert hashlib.sha256(store.read(version)).hexdigest() == version['sha256']
+
+
+def test_backup_unchanged_content_is_not_stored(po_file):
+    write_po(po_file, 50)
+    store = POBackupStore(po_file)
+
+    first, created = store.save()
+    again, created_again = store.save()
+
+    assert created and not created_again
+    assert again['version'] == first['version']
+    assert len(store.versions()) == 1
+
+
+def test_backup_restore_then_save_does_not_loop(po_file):
+    content_a = write_po(po_file, 5000)
+    store = POBackupStore(po_file)
+    store.save()
+    write_po(po_file, 5000, translated={1})
+    store.save()
+
+    # Volver al contenido A y seguir guardando versiones encima
+    store.restore(1)
+    assert po_file.read_bytes() == content_a
+    store.save()
+    content_c = write_po(po_file, 5000, translated={2, 3})
+    version, created = store.save()
+
+    assert created
+    assert store.read(version) == content_c
+    assert_all_versions_readable(store)
+
+
+def test_backup_stores_only_changed_chunks(po_file):
+    write_po(po_file, 5000)
+    store = POBackupStore(po_file)
+    first, _ = store.save()
+
+    write_po(po_file, 5000, translated={2500})
+    edited, _ = store.save()
+    write_po(po_file, 5000, translated={2500}, inserted={1000})
+    inserted, _ = store.save()
+
+    assert first['chunks'] > 5
+    assert edited['new_chunks'] <= 2
+    # Los cortes dependen del contenido: tras una inserción se resincronizan
+    assert inserted['new_chunks'] <= 3
+    assert_all_versions_readable(store)
+
+
+def test_backup_eviction_removes_unreferenced_chunks(po_file):
+    store = POBackupStore(po_file, keep=3)
+    for i in range(8):
+        write_po(po_file, 5000, translated={i * 600})
+        store.save()
+
+    versions = store.versions()
+    assert [v['version'] for v in versions] == [6, 7, 8]
+    assert_all_versions_readable(store)
+
+    referenced = {version['manifest'] for version in versions}
+    for version in versions:
+        referenced.update(f'{chunk_sha}.zz' for chunk_sha in store._manifest(version))
+    assert {path.name for path in store.objects_dir.glob('*/*.zz')} == referenced
+
+
+def test_backup_files_take_po_file_mode(po_file):
+    write_po(po_file, 50)
+    po_file.chmod(0o644)
+    store = POBackupStore(po_file)
+    version, _ = store.save()
+
+    assert store.index_path.stat().st_mode & 0o777 == 0o644
+    assert store._object_path(version['manifest']).stat().st_mode & 0o777 == 0o644
+
+
+class FakePluralClient:
+    """Cliente de la API que responde las formas plurales con una cantidad fija por llamada"""
+
+    def __init__(self, forms_per_call):
+        self.forms_per_call = list(forms_per_call)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        prompt = kwargs['messages'][1]['content']
+        items = json.loads(prompt[prompt.index('['):prompt.index(']\n') + 1])
+        n_forms = self.forms_per_call[min(self.calls, len(self.forms_per_call) - 1)]
+        self.calls += 1
+        data = {str(item['id']): [f"{item['plural']} {i}" for i in range(n_forms)] for item in items}
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(data)))])
+
+
+def plural_translator(client):
+    translator = POTranslator(api_key='test')
+    translator.client = client
+    return translator
+
+
+def plural_entry():
+    return SimpleNamespace(msgid='%(count)s archivo', msgid_plural='%(count)s archivos')
+
+
+def test_single_plural_entry_with_wrong_count_is_retried():
+    client = FakePluralClient([1, 2])
+    translator = plural_translator(client)
+
+    [forms] = translator.translate_plural_entries([plural_entry()], (2, '(n != 1)'), 'en')
+
+    assert forms == ['%(count)s archivos 0', '%(count)s archivos 1']
+    assert client.calls == 2
+
+
+def test_plural_retries_are_bounded():
+    client = FakePluralClient([3])
+    translator = plural_translator(client)
+
+    [forms] = translator.translate_plural_entries([plural_entry()], (2, '(n != 1)'), 'en')
+
+    assert forms is None
+    assert client.calls == 1 + POTranslator.PLURAL_RETRIES
+
+
+def test_streaming_reader_ignores_unknown_charset(tmp_path):
+    po_file = tmp_path / 'django.pot'
+    po_file.write_text(
+        'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=CHARSET\\n"\n\n'
+        'msgid "Canción"\nmsgstr ""\n',
+        encoding='utf-8',
+    )
+    reader = StreamingPOReader(po_file)
+
+    entries = list(reader)
+
+    assert reader.encoding == 'utf-8'
+    assert entries[-1].msgid == 'Canción'
+
+
+STREAMING_PO = '''\
+# Traducciones del sitio.
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=2; plural=(n != 1);\\n"
+
+#. Comentario extraído
+#: templates/base.html:10
+msgid "Ya traducido"
+msgstr "Already translated"
+
+#: views.py:20
+#, fuzzy, python-format
+msgid "Hola %(name)s"
+msgstr "Hola %(name)s"
+
+msgctxt "menú"
+msgid "Archivo"
+msgstr ""
+
+#, python-format
+msgid "%(count)s archivo"
+msgid_plural "%(count)s archivos"
+msgstr[0] ""
+msgstr[1] ""
+
+msgid ""
+"Un texto largo que ocupa varias líneas en el archivo .po y que debe "
+"traducirse completo.\\n"
+"Segunda línea."
+msgstr ""
+
+#~ msgid "Obsoleto"
+#~ msgstr ""
+
+msgid "Otro ya traducido"
+msgstr ""
+"Another already "
+"translated"
+'''
+
+UNTOUCHED_BLOCKS = [
+    '# Traducciones del sitio.\nmsgid ""\nmsgstr ""\n',
+    '#. Comentario extraído\n#: templates/base.html:10\nmsgid "Ya traducido"\nmsgstr "Already translated"\n',
+    '#~ msgid "Obsoleto"\n#~ msgstr ""\n',
+    'msgid "Otro ya traducido"\nmsgstr ""\n"Another already "\n"translated"\n',
+]
+
+
+def translate_catalog(tmp_path, stream):
+    po_file = tmp_path / ('stream' if stream else 'polib') / 'en' / 'LC_MESSAGES' / 'django.po'
+    po_file.parent.mkdir(parents=True)
+    po_file.write_text(STREAMING_PO, encoding='utf-8')
+
+    translator = plural_translator(FakePluralClient([2]))
+    translator.translate_text_smart = lambda text, target_lang: f'EN {text}'
+    assert translator.translate_po_file(po_file, stream=stream)
+    return po_file
+
+
+def entry_key(entry):
+    return (entry.msgctxt, entry.msgid, entry.msgid_plural, entry.msgstr,
+            dict(entry.msgstr_plural), sorted(entry.flags), entry.obsolete)
+
+
+def test_streaming_output_matches_polib_mode(tmp_path):
+    import polib
+
+    streamed = translate_catalog(tmp_path, stream=True)
+    rewritten = translate_catalog(tmp_path, stream=False)
+
+    # polib mueve las obsoletas al final al guardar; el streaming respeta el orden
+    streamed_entries = sorted(map(repr, map(entry_key, polib.pofile(str(streamed)))))
+    assert streamed_entries == sorted(map(repr, map(entry_key, polib.pofile(str(rewritten)))))
+    assert polib.pofile(str(streamed)).untranslated_entries() == []
+
+
+def test_streaming_rewrites_only_translated_blocks(tmp_path):
+    output = translate_catalog(tmp_path, stream=True).read_text(encoding='utf-8')
+
+    for block in UNTOUCHED_BLOCKS:
+        assert block in output
+
+    # El flag fuzzy se quita y se conservan los demás
+    assert '#: views.py:20\n#, python-format\nmsgid "Hola %(name)s"\nmsgstr "EN Hola %(name)s"\n' in output
+    assert 'fuzzy' not in output
+    assert ('msgctxt "menú"\nmsgid "Archivo"\nmsgstr "EN Archivo"\n') in output
+    assert ('msgid_plural "%(count)s archivos"\n'
+            'msgstr[0] "%(count)s archivos 0"\n'
+            'msgstr[1] "%(count)s archivos 1"\n\n') in output